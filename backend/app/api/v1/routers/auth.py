@@ -45,10 +45,12 @@ async def _record_failed_attempt(email: str, redis: Redis) -> None:
     attempts_key = f"{_LOGIN_ATTEMPTS_PREFIX}{email.lower()}"
     lockout_key = f"{_LOGIN_LOCKOUT_PREFIX}{email.lower()}"
 
-    count = await redis.incr(attempts_key)
-    if count == 1:
-        # First failure: set a sliding window equal to the lockout period
-        await redis.expire(attempts_key, settings.LOGIN_LOCKOUT_SECONDS)
+    # INCR + EXPIRE NX em uma única transação: uma ida ao Redis e a janela
+    # só é definida na primeira falha, sem chave órfã sem TTL.
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.incr(attempts_key)
+        pipe.expire(attempts_key, settings.LOGIN_LOCKOUT_SECONDS, nx=True)
+        count, _ = await pipe.execute()
 
     if count >= settings.LOGIN_MAX_ATTEMPTS:
         await redis.setex(lockout_key, settings.LOGIN_LOCKOUT_SECONDS, "1")
@@ -1,7 +1,15 @@
 from typing import Annotated, List, Optional
 import os
 import tempfile
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from redis.asyncio import Redis
@@ -11,6 +19,7 @@ from fastapi_limiter.depends import RateLimiter
 from app.core.base import get_db
 from app.core.cache.redis import get_redis
 from app.core.config import settings
+from app.core.messages import ErrorMessages
 from app.domains.auth.dependencies import get_current_user, require_roles
 from app.domains.users.schemas import UserRole
 from app.domains.loans.models import LoanStatus
@@ -28,6 +37,8 @@ from app.domains.users.services import UserService
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+USERS_PDF_FILENAME = "users.pdf"
+
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(
@@ -49,10 +60,21 @@ async def list_users(
     current_user: Annotated[User, Depends(require_roles({UserRole.ADMIN.value}))],
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE),
+    after_id: Optional[int] = Query(
+        None,
+        ge=0,
+        description="Cursor de keyset: ID do último usuário da página anterior; "
+        "não pode ser combinado com skip",
+    ),
     db: AsyncSession = Depends(get_db),
 ):
+    if after_id is not None and skip:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=ErrorMessages.USER_LIST_SKIP_WITH_AFTER_ID,
+        )
     service = UserService(db=db)
-    users = await service.list_users(skip=skip, limit=limit)
+    users = await service.list_users(skip=skip, limit=limit, after_id=after_id)
     return users
 
 
@@ -163,6 +185,27 @@ async def reset_user_password(
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.head(
+    "/export/pdf",
+    include_in_schema=False,
+    dependencies=[
+        Depends(
+            RateLimiter(
+                times=settings.RATE_LIMIT_TIMES, seconds=settings.RATE_LIMIT_SECONDS
+            )
+        )
+    ],
+)
+async def head_users_pdf(
+    current_user: Annotated[User, Depends(require_roles({UserRole.ADMIN.value}))],
+):
+    # Mesmos cabeçalhos do GET, sem gerar o PDF
+    return Response(
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="{USERS_PDF_FILENAME}"'},
+    )
+
+
 @router.get(
     "/export/pdf",
     dependencies=[
@@ -186,7 +229,7 @@ async def export_users_pdf(
     return FileResponse(
         temp_file.name,
         media_type="application/pdf",
-        filename="users.pdf",
+        filename=USERS_PDF_FILENAME,
         background=background_tasks,
     )
 
@@ -19,6 +19,7 @@ class ErrorMessages:
     USER_ACCOUNT_LOCKED = "Conta temporariamente bloqueada por excesso de tentativas. Tente novamente em {seconds} segundos"
     USER_CURRENT_PASSWORD_WRONG = "Senha atual incorreta"
     USER_NEW_PASSWORD_SAME_AS_CURRENT = "A nova senha não pode ser igual à senha atual"
+    USER_LIST_SKIP_WITH_AFTER_ID = "Informe skip ou after_id, não os dois"
 
     # Loans
     LOAN_NOT_FOUND = "Empréstimo não encontrado"
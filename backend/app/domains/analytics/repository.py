@@ -1,51 +1,63 @@
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import List, Tuple
+from typing import List, NamedTuple, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import func
+from sqlalchemy.orm import raiseload
 
 from app.domains.books.models import Book
 from app.domains.loans.models import Loan, LoanStatus
 from app.domains.users.models import User
 
 
+class SummaryScalars(NamedTuple):
+    total_books: int
+    total_users: int
+    active_loans: int
+    overdue_loans: int
+    total_fines: Decimal
+
+
 class AnalyticsRepository:
     """Repository para queries analíticas isoladas."""
 
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def count_total_books(self) -> int:
-        query = select(func.count(Book.id))
-        result = await self.db.execute(query)
-        return result.scalar() or 0
-
-    async def count_total_users(self) -> int:
-        query = select(func.count(User.id))
-        result = await self.db.execute(query)
-        return result.scalar() or 0
-
-    async def count_active_loans(self) -> int:
-        query = select(func.count(Loan.id)).where(Loan.status == LoanStatus.ACTIVE)
-        result = await self.db.execute(query)
-        return result.scalar() or 0
-
-    async def count_overdue_loans(self, current_date: datetime) -> int:
-        query = select(func.count(Loan.id)).where(
-            Loan.status == LoanStatus.ACTIVE,
-            Loan.expected_return_date < current_date,
+    async def fetch_summary_scalars(self, current_date: datetime) -> SummaryScalars:
+        """Retorna todos os indicadores escalares do dashboard em uma única query."""
+        is_active = Loan.status == LoanStatus.ACTIVE
+        query = select(
+            select(func.count(Book.id)).scalar_subquery().label("total_books"),
+            select(func.count(User.id)).scalar_subquery().label("total_users"),
+            func.count(Loan.id).filter(is_active).label("active_loans"),
+            func.count(Loan.id)
+            .filter(is_active, Loan.expected_return_date < current_date)
+            .label("overdue_loans"),
+            func.coalesce(func.sum(Loan.fine_amount), 0).label("total_fines"),
+        ).select_from(Loan)
+        row = (await self.db.execute(query)).one()
+        return SummaryScalars(
+            total_books=row.total_books or 0,
+            total_users=row.total_users or 0,
+            active_loans=row.active_loans or 0,
+            overdue_loans=row.overdue_loans or 0,
+            total_fines=Decimal(str(row.total_fines or 0)),
         )
-        result = await self.db.execute(query)
-        return result.scalar() or 0
-
-    async def sum_total_fines(self) -> Decimal:
-        query = select(func.coalesce(func.sum(Loan.fine_amount), 0))
-        result = await self.db.execute(query)
-        return Decimal(str(result.scalar() or 0))
 
     async def find_recent_books(self, limit: int = 5) -> List[Book]:
-        query = select(Book).order_by(Book.id.desc()).limit(limit)
+        """Retorna os livros mais recentes sem carregar relacionamentos.
+
+        O dashboard só usa colunas do próprio livro; ``raiseload`` impede que
+        um acesso acidental a ``Book.loans`` vire uma query por livro.
+        """
+        query = (
+            select(Book)
+            .options(raiseload(Book.loans))
+            .order_by(Book.id.desc())
+            .limit(limit)
+        )
         result = await self.db.execute(query)
         return result.scalars().all()  # type: ignore
 
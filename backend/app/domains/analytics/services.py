@@ -18,11 +18,7 @@ class AnalyticsService:
         """Retorna todos os indicadores do dashboard unificado."""
         now = datetime.now(timezone.utc)
 
-        total_books = await self.repository.count_total_books()
-        total_users = await self.repository.count_total_users()
-        active_loans = await self.repository.count_active_loans()
-        overdue_loans = await self.repository.count_overdue_loans(now)
-        total_fines = await self.repository.sum_total_fines()
+        scalars = await self.repository.fetch_summary_scalars(now)
         recent_books_models = await self.repository.find_recent_books(limit=5)
         most_borrowed_rows = await self.repository.find_most_borrowed_books(limit=5)
 
@@ -49,11 +45,11 @@ class AnalyticsService:
         ]
 
         return DashboardSummary(
-            total_books=total_books,
-            total_users=total_users,
-            active_loans=active_loans,
-            overdue_loans=overdue_loans,
-            total_fines=total_fines,
+            total_books=scalars.total_books,
+            total_users=scalars.total_users,
+            active_loans=scalars.active_loans,
+            overdue_loans=scalars.overdue_loans,
+            total_fines=scalars.total_fines,
             recent_books=recent_books,
             most_borrowed_books=most_borrowed_books,
         )
@@ -1,7 +1,11 @@
+import hashlib
+import time
 from datetime import datetime, timezone
-from typing import Annotated, Iterable
+from typing import Annotated, Any, Iterable
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from redis.asyncio import Redis
@@ -33,7 +37,36 @@ async def blacklist_token(token: str, ttl_seconds: int, redis: Redis) -> None:
     await redis.setex(f"{_TOKEN_BLACKLIST_PREFIX}{token}", ttl_seconds, "1")
 
 
-_PASSWORD_RESET_ALLOWED_PATHS = {"/users/me/reset-password", "/logout"}
+# Claims já verificados, indexados pelo hash do token. O TTL curto limita o
+# tempo em memória; a expiração do próprio token é conferida a cada acesso e a
+# blacklist continua sendo consultada no Redis em toda requisição.
+_DECODED_TOKEN_CACHE: TTLCache[bytes, dict[str, Any]] = TTLCache(
+    maxsize=10_000, ttl=30
+)
+
+
+def _decode_token(token: str, algorithm: str) -> dict[str, Any]:
+    """Decodifica o JWT reaproveitando claims verificados recentemente."""
+    cache_key = hashlib.sha256(
+        f"{settings.SECRET_KEY}:{algorithm}:{token}".encode()
+    ).digest()
+    payload = _DECODED_TOKEN_CACHE.get(cache_key)
+    if payload is not None:
+        exp = payload.get("exp")
+        if exp is None or exp > time.time():
+            return payload
+        _DECODED_TOKEN_CACHE.pop(cache_key, None)
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[algorithm])
+    _DECODED_TOKEN_CACHE[cache_key] = payload
+    return payload
+
+
+_USER_BY_EMAIL_STMT = select(User).where(User.email == bindparam("email"))
+
+_PASSWORD_RESET_ALLOWED_PATHS: frozenset[str] = frozenset(
+    {"/users/me/reset-password", "/logout"}
+)
 
 
 async def get_current_user(
@@ -65,15 +98,18 @@ async def get_current_user(
         logger.error("Unsafe JWT algorithm configured", algorithm=algorithm)
         raise credentials_exception
 
+    # JWT compacto tem sempre três segmentos; rejeita antes do Redis e do decode
+    if not token or token.count(".") != 2:
+        logger.warning("Malformed token")
+        raise credentials_exception
+
     # Verificar se o token foi revogado (logout)
     if await is_token_blacklisted(token, redis):
         logger.warning("Blacklisted token used")
         raise credentials_exception
 
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[algorithm]
-        )
+        payload = _decode_token(token, algorithm)
         email: str | None = payload.get("sub")
         if email is None:
             logger.warning("Token missing 'sub' claim")
@@ -82,8 +118,7 @@ async def get_current_user(
         logger.warning("Invalid token", error=str(e))
         raise credentials_exception
 
-    query = select(User).where(User.email == email)
-    result = await db.execute(query)
+    result = await db.execute(_USER_BY_EMAIL_STMT, {"email": email})
     user = result.scalar_one_or_none()
 
     if user is None:
@@ -24,18 +24,25 @@ class UserRepository:
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
-    async def find_all(self, skip: int = 0, limit: int = 10) -> List[User]:
+    async def find_all(
+        self, skip: int = 0, limit: int = 10, after_id: Optional[int] = None
+    ) -> List[User]:
         """
-        Lista usuários com paginação.
+        Lista usuários com paginação, ordenados por ID.
 
         Args:
-            skip: Número de registros a pular
+            skip: Número de registros a pular (ignorado quando after_id é informado)
             limit: Número máximo de registros a retornar
+            after_id: Cursor de keyset; retorna apenas usuários com ID maior
 
         Returns:
             List[User]: Lista de usuários encontrados
         """
-        query = select(User).offset(skip).limit(limit)
+        query = select(User).order_by(User.id).limit(limit)
+        if after_id is not None:
+            query = query.where(User.id > after_id)
+        else:
+            query = query.offset(skip)
         result = await self.db.execute(query)
         return result.scalars().all()  # type: ignore
 
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -154,18 +154,21 @@ class UserService:
         await self.db.refresh(user)
         return user
 
-    async def list_users(self, skip: int = 0, limit: int = 10) -> List[User]:
+    async def list_users(
+        self, skip: int = 0, limit: int = 10, after_id: Optional[int] = None
+    ) -> List[User]:
         """
-        Lista usuários com paginação.
+        Lista usuários com paginação por offset ou por cursor (keyset).
 
         Args:
             skip: Número de registros a pular (paginação)
             limit: Número máximo de registros a retornar
+            after_id: ID do último usuário da página anterior
 
         Returns:
             List[User]: Lista de usuários
         """
-        return await self.repository.find_all(skip=skip, limit=limit)
+        return await self.repository.find_all(skip=skip, limit=limit, after_id=after_id)
 
     async def lookup_users(
         self, query_text: str, skip: int = 0, limit: int = 10
@@ -4,6 +4,7 @@ import structlog
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi_limiter import FastAPILimiter
 
 from app.api.v1.routers import auth as auth_routes
@@ -33,7 +34,9 @@ async def lifespan(app: FastAPI):
 
 
 app = FastAPI(
-    title="LibSys - Sistema de Gerenciamento de Biblioteca Digital", lifespan=lifespan
+    title="LibSys - Sistema de Gerenciamento de Biblioteca Digital",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
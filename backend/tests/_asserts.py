@@ -0,0 +1,25 @@
+from typing import Any, Optional
+
+_USER_RESPONSE_FIELDS = frozenset(
+    {"id", "name", "email", "role", "is_active", "must_reset_password", "created_at"}
+)
+_FORBIDDEN_USER_FIELDS = frozenset({"password", "hashed_password"})
+
+
+def assert_user_response_shape(
+    data: dict[str, Any],
+    *,
+    email: Optional[str] = None,
+    role: Optional[str] = None,
+    must_reset_password: Optional[bool] = None,
+) -> None:
+    """Valida o formato de um UserResponse e, opcionalmente, alguns valores."""
+    keys = data.keys()
+    assert _USER_RESPONSE_FIELDS <= keys, _USER_RESPONSE_FIELDS - keys
+    assert keys.isdisjoint(_FORBIDDEN_USER_FIELDS), keys & _FORBIDDEN_USER_FIELDS
+    if email is not None:
+        assert data["email"] == email
+    if role is not None:
+        assert data["role"] == role
+    if must_reset_password is not None:
+        assert data["must_reset_password"] is must_reset_password
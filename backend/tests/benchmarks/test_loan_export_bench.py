@@ -0,0 +1,73 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.domains.loans.models import LoanStatus
+from app.domains.loans.repository import LoanRepository
+from app.domains.loans.services import LoanService
+from tests.unit._async_stub import empty_scan_iter, stub_async_methods
+
+_FIXED_NOW = datetime(2025, 1, 10, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _fixed_now() -> datetime:
+    return _FIXED_NOW
+
+
+def _export_rows(count: int) -> list[SimpleNamespace]:
+    """Linhas com os atributos que ``export_loans_csv`` lê, metade em atraso."""
+    user = SimpleNamespace(name="John Doe")
+    book = SimpleNamespace(title="Python Programming")
+    return [
+        SimpleNamespace(
+            id=i,
+            user_id=1,
+            book_id=1,
+            user=user,
+            book=book,
+            loan_date=_FIXED_NOW - timedelta(days=20),
+            expected_return_date=_FIXED_NOW + timedelta(days=(-5 if i % 2 else 5)),
+            return_date=None,
+            status=LoanStatus.ACTIVE,
+            fine_amount=Decimal("0.00"),
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def event_loop_for_benchmark():
+    # Loop próprio: o benchmark chama de forma síncrona, várias vezes
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.benchmark(group="export_csv")
+@pytest.mark.parametrize("row_count", [1, 100, 10_000])
+def test_export_loans_csv_throughput(benchmark, event_loop_for_benchmark, row_count):
+    rows = _export_rows(row_count)
+    service = LoanService(
+        SimpleNamespace(),
+        SimpleNamespace(scan_iter=empty_scan_iter),
+        get_now_fn=_fixed_now,
+    )
+    service.loan_repository = stub_async_methods(
+        LoanRepository, "find_all_with_relations"
+    )
+    service.loan_repository.find_all_with_relations.side_effect = (
+        lambda **kwargs: rows[kwargs["skip"] : kwargs["skip"] + kwargs["limit"]]
+    )
+
+    async def drain() -> int:
+        lines = 0
+        async for chunk in service.export_loans_csv():
+            lines += chunk.count("\n")
+        return lines
+
+    lines = benchmark(lambda: event_loop_for_benchmark.run_until_complete(drain()))
+
+    assert lines == row_count + 1
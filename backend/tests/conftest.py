@@ -1,76 +1,308 @@
+import logging
 import os
+import secrets
 import pytest
+import structlog
+import time_machine
 from typing import AsyncGenerator
+from urllib.parse import urlsplit, urlunsplit
 from httpx import AsyncClient, ASGITransport
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.pool import NullPool
-from fastapi_limiter import FastAPILimiter
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+from sqlalchemy import URL, event, make_url, text
+from sqlalchemy.pool import NullPool, StaticPool
+from fakeredis import FakeAsyncRedis, FakeServer
+from passlib.context import CryptContext
 from redis.asyncio import Redis
 
 from app.main import app
 from app.core.base import Base, get_db
 from app.core.cache.redis import get_redis
 from app.domains.auth.dependencies import get_current_user
+from app.domains.auth import security
+from app.domains.auth.security import get_password_hash
 from app.domains.users.models import User
 from app.domains.users.schemas import UserRole
 from tests.factories import UserFactory, BookFactory, LoanFactory
 
 
-DATABASE_URL = os.getenv(
-    "DATABASE_URL", "postgresql+asyncpg://postgres:postgres@db:5432/libsys"
+# Sem echo e sem logs de INFO por request/query: a formatação das mensagens
+# custa mais que as próprias requisições em memória.
+logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
+logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+structlog.configure(
+    wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
 )
-REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/1")
 
+# Com pytest-xdist cada worker (gw0, gw1, ...) recebe um banco e um db do
+# Redis próprios; o sqlite em memória já é isolado por processo.
+WORKER_ID = os.getenv("PYTEST_XDIST_WORKER")
+WORKER_INDEX = int(WORKER_ID.removeprefix("gw")) if WORKER_ID else 0
+
+# TEST_DATABASE_URL tem prioridade; um DATABASE_URL exportado no ambiente
+# também serve. Sem nenhum dos dois, sqlite em memória.
+DATABASE_URL = (
+    os.getenv("TEST_DATABASE_URL")
+    or os.getenv("DATABASE_URL")
+    or "sqlite+aiosqlite:///:memory:"
+)
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+if WORKER_ID and not IS_SQLITE:
+    _url = make_url(DATABASE_URL)
+    _url = _url.set(database=f"{_url.database}_{WORKER_ID}")
+    DATABASE_URL = _url.render_as_string(hide_password=False)
+
+# Sem TEST_REDIS_URL os testes usam um fakeredis em processo. Com ele, cada
+# worker usa o db base + índice do worker; o Redis padrão só tem 16 dbs
+# (``databases`` no redis.conf), informados via TEST_REDIS_DATABASES.
+REDIS_URL = os.getenv("TEST_REDIS_URL")
+REDIS_DATABASES = int(os.getenv("TEST_REDIS_DATABASES", "16"))
+if REDIS_URL:
+    _redis_url = urlsplit(REDIS_URL)
+    REDIS_BASE_DB = int(_redis_url.path.lstrip("/") or 0)
+    REDIS_URL = urlunsplit(
+        _redis_url._replace(path=f"/{REDIS_BASE_DB + WORKER_INDEX}")
+    )
+FROZEN_NOW = "2024-01-15T12:00:00Z"
+FAST_HASH = os.getenv("LIBSYS_FAST_HASH") == "1"
+
+
+def pytest_configure(config):
+    # Checado no processo principal, antes de subir os workers: um db fora do
+    # intervalo só apareceria como "DB index is out of range" em cada teste.
+    if not REDIS_URL or WORKER_ID:
+        return
+    workers = getattr(config.option, "numprocesses", None) or 1
+    last_db = REDIS_BASE_DB + workers - 1
+    if last_db >= REDIS_DATABASES:
+        raise pytest.UsageError(
+            f"{workers} workers a partir do db {REDIS_BASE_DB} do Redis precisam "
+            f"do db {last_db}, mas o Redis tem {REDIS_DATABASES} "
+            "(TEST_REDIS_DATABASES); reduza -n ou use um db base menor"
+        )
+
+
+POSTGRES_SKIP_REASON = "requer Postgres (locks de linha)"
+
+
+def pytest_collection_modifyitems(config, items):
+    if not IS_SQLITE:
+        return
+    skip_postgres = pytest.mark.skip(reason=POSTGRES_SKIP_REASON)
+    for item in items:
+        if "needs_postgres" in item.keywords:
+            item.add_marker(skip_postgres)
+
+
+def pytest_terminal_summary(terminalreporter):
+    # Um aviso por sessão: sem ele os testes de concorrência somem no "skipped"
+    skipped = [
+        report
+        for report in terminalreporter.stats.get("skipped", [])
+        if POSTGRES_SKIP_REASON in str(report.longrepr)
+    ]
+    if skipped:
+        terminalreporter.write_sep(
+            "=",
+            f"{len(skipped)} teste(s) needs_postgres pulado(s) no sqlite; "
+            "defina TEST_DATABASE_URL (ou DATABASE_URL) para rodá-los",
+            yellow=True,
+        )
+
+
+class FastPasswordContext:
+    """
+    Substituto do CryptContext para testes com LIBSYS_FAST_HASH=1.
+
+    Mantém um salt aleatório por hash, mas troca o argon2 por comparação
+    direta para que criar usuários não custe CPU.
+    """
+
+    prefix = "test$"
+
+    def hash(self, secret: str) -> str:
+        return f"{self.prefix}{secrets.token_hex(4)}${secret}"
+
+    def verify(self, secret: str, hashed: str) -> bool:
+        if not hashed.startswith(self.prefix):
+            return False
+        _, _, plain = hashed[len(self.prefix) :].partition("$")
+        return secrets.compare_digest(plain.encode(), secret.encode())
+
+
+# argon2 real, mas com o custo mínimo: os testes validam o fluxo, não a
+# resistência do KDF.
+LOW_COST_ARGON2 = CryptContext(
+    schemes=["argon2"],
+    argon2__time_cost=1,
+    argon2__memory_cost=8,
+    argon2__parallelism=1,
+)
 
-@pytest.fixture(scope="function")
-async def db_session() -> AsyncGenerator[AsyncSession, None]:
-    engine = create_async_engine(DATABASE_URL, echo=False, poolclass=NullPool)
-    session_factory = async_sessionmaker(
-        bind=engine, class_=AsyncSession, expire_on_commit=False
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
+    context = FastPasswordContext() if FAST_HASH else LOW_COST_ARGON2
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(security, "pwd_context", context)
+        yield
+
+
+def _admin_engine(url: URL) -> AsyncEngine:
+    # CREATE/DROP DATABASE não rodam dentro de transação
+    return create_async_engine(
+        url.set(database="postgres"), isolation_level="AUTOCOMMIT", poolclass=NullPool
     )
 
+
+async def _create_database_if_missing(url: URL) -> None:
+    admin_engine = _admin_engine(url)
+    async with admin_engine.connect() as conn:
+        exists = await conn.scalar(
+            text("SELECT 1 FROM pg_database WHERE datname = :name"),
+            {"name": url.database},
+        )
+        if not exists:
+            await conn.execute(text(f'CREATE DATABASE "{url.database}"'))
+    await admin_engine.dispose()
+
+
+async def _drop_database(url: URL) -> None:
+    admin_engine = _admin_engine(url)
+    async with admin_engine.connect() as conn:
+        await conn.execute(text(f'DROP DATABASE IF EXISTS "{url.database}"'))
+    await admin_engine.dispose()
+
+
+@pytest.fixture(scope="session")
+async def db_engine() -> AsyncGenerator[AsyncEngine, None]:
+    if IS_SQLITE:
+        engine = create_async_engine(
+            DATABASE_URL,
+            echo=False,
+            poolclass=StaticPool,
+            connect_args={"check_same_thread": False},
+        )
+
+        # O driver sqlite não emite BEGIN por conta própria; sem isso os
+        # SAVEPOINTs do db_session não isolam os testes.
+        @event.listens_for(engine.sync_engine, "connect")
+        def _disable_driver_transactions(dbapi_connection, _):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine.sync_engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN")
+
+    else:
+        if WORKER_ID:
+            await _create_database_if_missing(make_url(DATABASE_URL))
+        engine = create_async_engine(DATABASE_URL, echo=False, poolclass=NullPool)
+
     async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
 
-    async with session_factory() as session:
-        yield session
+    yield engine
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
     await engine.dispose()
 
+    # O banco <db>_gwN é só deste worker; removê-lo evita acumular um banco
+    # vazio por worker no servidor a cada valor de -n já usado.
+    if WORKER_ID and not IS_SQLITE:
+        await _drop_database(make_url(DATABASE_URL))
+
+
+@pytest.fixture(scope="session")
+async def seeded_user_ids(db_engine: AsyncEngine) -> dict[str, int]:
+    # Admin e membro são gravados uma única vez, fora da transação de cada
+    # teste; alterações feitas nos testes são desfeitas no rollback.
+    admin = UserFactory.build(email="admin@test.com", role=UserRole.ADMIN.value)
+    member = UserFactory.build(email="member@test.com", role=UserRole.USER.value)
+    async with AsyncSession(bind=db_engine, expire_on_commit=False) as session:
+        session.add_all([admin, member])
+        await session.commit()
+    return {"admin": admin.id, "member": member.id}
+
+
+@pytest.fixture(scope="session")
+async def db_connection(
+    db_engine: AsyncEngine,
+    seeded_user_ids: dict[str, int],
+) -> AsyncGenerator[AsyncConnection, None]:
+    async with db_engine.connect() as conn:
+        yield conn
+
+
+@pytest.fixture(scope="function")
+async def db_session(
+    db_connection: AsyncConnection,
+) -> AsyncGenerator[AsyncSession, None]:
+    transaction = await db_connection.begin()
+    session = AsyncSession(
+        bind=db_connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+
+    yield session
+
+    await session.close()
+    await transaction.rollback()
+
+
+@pytest.fixture
+def frozen_time():
+    with time_machine.travel(FROZEN_NOW, tick=False) as traveller:
+        yield traveller
+
 
 @pytest.fixture(scope="function")
 async def redis_client_test() -> AsyncGenerator[Redis, None]:
-    redis = Redis.from_url(REDIS_URL, encoding="utf-8", decode_responses=True)
-    await FastAPILimiter.init(redis)
+    if REDIS_URL:
+        redis = Redis.from_url(REDIS_URL, encoding="utf-8", decode_responses=True)
+    else:
+        redis = FakeAsyncRedis(server=FakeServer(), decode_responses=True)
     await redis.flushdb()
     yield redis
     await redis.aclose()
 
 
 @pytest.fixture(scope="function")
-async def authenticated_user(db_session: AsyncSession) -> User:
-    user = UserFactory.build(email="admin@test.com", role=UserRole.ADMIN.value)
-    db_session.add(user)
-    await db_session.commit()
-    await db_session.refresh(user)
-    return user
+async def authenticated_user(
+    db_session: AsyncSession, seeded_user_ids: dict[str, int]
+) -> User:
+    return await db_session.get(User, seeded_user_ids["admin"])
 
 
 @pytest.fixture(scope="function")
-async def authenticated_member(db_session: AsyncSession) -> User:
-    user = UserFactory.build(email="member@test.com", role=UserRole.USER.value)
-    db_session.add(user)
-    await db_session.commit()
-    await db_session.refresh(user)
-    return user
+async def authenticated_member(
+    db_session: AsyncSession, seeded_user_ids: dict[str, int]
+) -> User:
+    return await db_session.get(User, seeded_user_ids["member"])
+
+
+@pytest.fixture(scope="session")
+async def http_client() -> AsyncGenerator[AsyncClient, None]:
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as c:
+        yield c
 
 
 @pytest.fixture(scope="function")
 async def client(
-    db_session: AsyncSession, redis_client_test: Redis, authenticated_user: User
+    http_client: AsyncClient,
+    db_session: AsyncSession,
+    redis_client_test: Redis,
+    authenticated_user: User,
 ) -> AsyncGenerator[AsyncClient, None]:
     async def override_get_db():
         yield db_session
@@ -85,17 +317,17 @@ async def client(
     app.dependency_overrides[get_redis] = override_get_redis
     app.dependency_overrides[get_current_user] = override_get_current_user
 
-    async with AsyncClient(
-        transport=ASGITransport(app=app), base_url="http://test"
-    ) as c:
-        yield c
+    http_client.cookies.clear()
+    yield http_client
 
     app.dependency_overrides.clear()
 
 
 @pytest.fixture(scope="function")
 async def client_unauthenticated(
-    db_session: AsyncSession, redis_client_test: Redis
+    http_client: AsyncClient,
+    db_session: AsyncSession,
+    redis_client_test: Redis,
 ) -> AsyncGenerator[AsyncClient, None]:
     async def override_get_db():
         yield db_session
@@ -106,17 +338,18 @@ async def client_unauthenticated(
     app.dependency_overrides[get_db] = override_get_db
     app.dependency_overrides[get_redis] = override_get_redis
 
-    async with AsyncClient(
-        transport=ASGITransport(app=app), base_url="http://test"
-    ) as c:
-        yield c
+    http_client.cookies.clear()
+    yield http_client
 
     app.dependency_overrides.clear()
 
 
 @pytest.fixture(scope="function")
 async def client_user(
-    db_session: AsyncSession, redis_client_test: Redis, authenticated_member: User
+    http_client: AsyncClient,
+    db_session: AsyncSession,
+    redis_client_test: Redis,
+    authenticated_member: User,
 ) -> AsyncGenerator[AsyncClient, None]:
     async def override_get_db():
         yield db_session
@@ -131,10 +364,8 @@ async def client_user(
     app.dependency_overrides[get_redis] = override_get_redis
     app.dependency_overrides[get_current_user] = override_get_current_user
 
-    async with AsyncClient(
-        transport=ASGITransport(app=app), base_url="http://test"
-    ) as c:
-        yield c
+    http_client.cookies.clear()
+    yield http_client
 
     app.dependency_overrides.clear()
 
@@ -159,8 +390,7 @@ async def create_user(db_session: AsyncSession):
     async def _create_user(**kwargs):
         user = UserFactory.build(**kwargs)
         db_session.add(user)
-        await db_session.commit()
-        await db_session.refresh(user)
+        await db_session.flush()
         return user
 
     return _create_user
@@ -171,20 +401,41 @@ async def create_book(db_session: AsyncSession):
     async def _create_book(**kwargs):
         book = BookFactory.build(**kwargs)
         db_session.add(book)
-        await db_session.commit()
-        await db_session.refresh(book)
+        await db_session.flush()
         return book
 
     return _create_book
 
 
+@pytest.fixture
+async def create_books(db_session: AsyncSession):
+    async def _create_books(count: int, **kwargs):
+        books = BookFactory.build_batch(count, **kwargs)
+        db_session.add_all(books)
+        await db_session.flush()
+        return books
+
+    return _create_books
+
+
+@pytest.fixture
+async def create_users(db_session: AsyncSession):
+    async def _create_users(count: int, **kwargs):
+        kwargs.setdefault("hashed_password", get_password_hash("password123"))
+        users = UserFactory.build_batch(count, **kwargs)
+        db_session.add_all(users)
+        await db_session.flush()
+        return users
+
+    return _create_users
+
+
 @pytest.fixture
 async def create_loan(db_session: AsyncSession):
     async def _create_loan(user_id: int, book_id: int, **kwargs):
         loan = LoanFactory.build(user_id=user_id, book_id=book_id, **kwargs)
         db_session.add(loan)
-        await db_session.commit()
-        await db_session.refresh(loan)
+        await db_session.flush()
         return loan
 
     return _create_loan
@@ -12,6 +12,14 @@ from datetime import datetime, timedelta, timezone
 fake = Faker()
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _days_from_now(days: int) -> datetime:
+    return _utcnow() + timedelta(days=days)
+
+
 class UserFactory(factory.Factory):  # type: ignore
     class Meta:  # type: ignore
         model = User
@@ -39,27 +47,21 @@ class LoanFactory(factory.Factory):  # type: ignore
     class Meta:  # type: ignore
         model = Loan
 
-    user_id = None
-    book_id = None
-    loan_date = LazyAttribute(lambda _: datetime.now(timezone.utc))
+    user_id: int | None = None
+    book_id: int | None = None
+    loan_date = LazyAttribute(lambda _: _utcnow())
     expected_return_date = LazyAttribute(lambda obj: obj.loan_date + timedelta(days=14))
     status = LoanStatus.ACTIVE
 
 
 class OverdueLoanFactory(LoanFactory):
-    loan_date = LazyAttribute(lambda _: datetime.now(timezone.utc) - timedelta(days=30))
-    expected_return_date = LazyAttribute(
-        lambda _: datetime.now(timezone.utc) - timedelta(days=16)
-    )
+    loan_date = LazyAttribute(lambda _: _days_from_now(-30))
+    expected_return_date = LazyAttribute(lambda _: _days_from_now(-16))
     status = LoanStatus.ACTIVE
 
 
 class ReturnedLoanFactory(LoanFactory):
-    loan_date = LazyAttribute(lambda _: datetime.now(timezone.utc) - timedelta(days=20))
-    expected_return_date = LazyAttribute(
-        lambda _: datetime.now(timezone.utc) - timedelta(days=6)
-    )
-    return_date = LazyAttribute(
-        lambda _: datetime.now(timezone.utc) - timedelta(days=5)
-    )
+    loan_date = LazyAttribute(lambda _: _days_from_now(-20))
+    expected_return_date = LazyAttribute(lambda _: _days_from_now(-6))
+    return_date = LazyAttribute(lambda _: _days_from_now(-5))
     status = LoanStatus.RETURNED
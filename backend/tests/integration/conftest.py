@@ -0,0 +1,55 @@
+import time
+from collections import OrderedDict
+from typing import AsyncGenerator
+
+import pytest
+from fastapi_limiter import FastAPILimiter
+
+
+class InMemoryRateLimitStorage:
+    """
+    Backend em memória para o FastAPILimiter nos testes.
+
+    Replica o script Lua do fastapi-limiter (janela fixa com expiração em ms)
+    sobre um LRU em processo, evitando um round-trip ao Redis por requisição.
+    Usa time.time() para que o fixture frozen_time consiga avançar a janela.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._windows: OrderedDict[str, tuple[int, float]] = OrderedDict()
+
+    async def script_load(self, script: str) -> str:
+        return "in-memory"
+
+    async def evalsha(
+        self, sha: str, numkeys: int, key: str, times: str, milliseconds: str
+    ) -> int:
+        now = time.time()
+        current, expires_at = self._windows.get(key, (0, now))
+        if current > 0 and expires_at > now:
+            self._windows.move_to_end(key)
+            if current + 1 > int(times):
+                return max(int((expires_at - now) * 1000), 1)
+            self._windows[key] = (current + 1, expires_at)
+            return 0
+
+        self._windows[key] = (1, now + int(milliseconds) / 1000)
+        self._windows.move_to_end(key)
+        if len(self._windows) > self.maxsize:
+            self._windows.popitem(last=False)
+        return 0
+
+    def clear(self) -> None:
+        self._windows.clear()
+
+    async def close(self) -> None:
+        self.clear()
+
+
+@pytest.fixture(autouse=True)
+async def rate_limit_storage() -> AsyncGenerator[InMemoryRateLimitStorage, None]:
+    storage = InMemoryRateLimitStorage()
+    await FastAPILimiter.init(storage)
+    yield storage
+    storage.clear()
@@ -1,6 +1,11 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
 import pytest
 from httpx import AsyncClient
 
+from app.domains.loans.models import LoanStatus
+
 
 class TestAnalyticsDashboard:
     @pytest.mark.asyncio
@@ -34,3 +39,36 @@ class TestAnalyticsDashboard:
         assert data["total_books"] >= 1
         assert data["total_users"] >= 1
         assert data["active_loans"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_dashboard_counts_overdue_and_fines(
+        self, client: AsyncClient, authenticated_user, create_book, create_loan
+    ):
+        book = await create_book()
+        now = datetime.now(timezone.utc)
+        await create_loan(
+            user_id=authenticated_user.id,
+            book_id=book.id,
+            expected_return_date=now - timedelta(days=3),
+        )
+        await create_loan(
+            user_id=authenticated_user.id,
+            book_id=book.id,
+            expected_return_date=now + timedelta(days=3),
+        )
+        await create_loan(
+            user_id=authenticated_user.id,
+            book_id=book.id,
+            status=LoanStatus.RETURNED,
+            return_date=now,
+            fine_amount=Decimal("4.50"),
+        )
+
+        response = await client.get("/analytics/dashboard")
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["active_loans"] == 2
+        assert data["overdue_loans"] == 1
+        assert Decimal(str(data["total_fines"])) == Decimal("4.50")
+        assert data["most_borrowed_books"][0]["loan_count"] == 3
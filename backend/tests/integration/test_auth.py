@@ -6,6 +6,7 @@ import pytest
 from httpx import AsyncClient
 from redis.asyncio import Redis
 
+from app.core.config import settings
 from app.domains.auth.security import create_access_token, get_password_hash
 from app.domains.users.schemas import UserRole
 
@@ -265,6 +266,25 @@ class TestLoginLockout:
         assert response.status_code == 429
         assert "bloqueada" in response.json()["detail"]
 
+    @pytest.mark.asyncio
+    async def test_failed_attempt_counter_expires_with_lockout_window(
+        self, client_unauthenticated: AsyncClient, create_user, redis_client_test: Redis
+    ):
+        """The attempt counter must carry the lockout TTL set on the first failure."""
+        user = await create_user(
+            hashed_password=get_password_hash(TEST_PASSWORD),
+            role=UserRole.ADMIN.value,
+        )
+        attempts_key = f"login:attempts:{user.email.lower()}"
+        for _ in range(2):
+            await client_unauthenticated.post(
+                "/token", data={"username": user.email, "password": "wrong"}
+            )
+
+        assert await redis_client_test.get(attempts_key) == "2"
+        ttl = await redis_client_test.ttl(attempts_key)
+        assert 0 < ttl <= settings.LOGIN_LOCKOUT_SECONDS
+
     @pytest.mark.asyncio
     async def test_lockout_blocks_even_correct_password(
         self, client_unauthenticated: AsyncClient, create_user, redis_client_test: Redis
@@ -27,9 +27,9 @@ class TestCreateBook:
 
     @pytest.mark.asyncio
     async def test_create_book_duplicate_isbn(
-        self, client: AsyncClient, valid_book_data
+        self, client: AsyncClient, valid_book_data, create_book
     ):
-        await client.post("/books/", json=valid_book_data)
+        await create_book(isbn=valid_book_data["isbn"])
         response = await client.post("/books/", json=valid_book_data)
         assert response.status_code == 400
         assert "ISBN já registrado" in response.json()["detail"]
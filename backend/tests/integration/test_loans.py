@@ -4,11 +4,13 @@ from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from sqlalchemy import select, func
+from sqlalchemy import select, func, text
+from typing import AsyncGenerator
 
 from app.domains.loans.models import Loan, LoanStatus
 from app.main import app
-from app.core.base import get_db
+from app.core.base import Base, get_db
+from app.core.config import settings
 from app.core.cache.redis import get_redis
 from app.domains.auth.dependencies import get_current_user
 from tests.factories import BookFactory, LoanFactory, OverdueLoanFactory
@@ -91,9 +93,9 @@ class TestCreateLoan:
 class TestMaxActiveLoansLimit:
     @pytest.mark.asyncio
     async def test_max_three_active_loans(
-        self, client: AsyncClient, authenticated_user, create_book
+        self, client: AsyncClient, authenticated_user, create_books
     ):
-        books = [await create_book() for _ in range(4)]
+        books = await create_books(4)
         for i in range(3):
             response = await client.post(
                 "/loans/",
@@ -109,9 +111,9 @@ class TestMaxActiveLoansLimit:
 
     @pytest.mark.asyncio
     async def test_can_loan_after_return(
-        self, client: AsyncClient, authenticated_user, create_book
+        self, client: AsyncClient, authenticated_user, create_books
     ):
-        books = [await create_book() for _ in range(4)]
+        books = await create_books(4)
         loan_ids = []
         for i in range(3):
             response = await client.post(
@@ -134,10 +136,11 @@ class TestBlockLoanIfOverdue:
         self,
         client: AsyncClient,
         authenticated_user,
-        create_book,
+        create_books,
         db_session: AsyncSession,
+        frozen_time,
     ):
-        books = [await create_book() for _ in range(2)]
+        books = await create_books(2)
         overdue_loan = OverdueLoanFactory.build(
             user_id=authenticated_user.id, book_id=books[0].id
         )
@@ -152,9 +155,9 @@ class TestBlockLoanIfOverdue:
 
     @pytest.mark.asyncio
     async def test_allow_loan_if_no_overdue(
-        self, client: AsyncClient, authenticated_user, create_book, create_loan
+        self, client: AsyncClient, authenticated_user, create_books, create_loan
     ):
-        books = [await create_book() for _ in range(2)]
+        books = await create_books(2)
         await create_loan(
             user_id=authenticated_user.id,
             book_id=books[0].id,
@@ -229,6 +232,7 @@ class TestReturnLoanWithFine:
         authenticated_user,
         create_book,
         db_session: AsyncSession,
+        frozen_time,
     ):
         book = await create_book()
         now = datetime.now(timezone.utc)
@@ -246,8 +250,8 @@ class TestReturnLoanWithFine:
         response = await client.post(f"/loans/{loan.id}/return")
         assert response.status_code == 200
         data = response.json()
-        assert data["days_overdue"] >= 5
-        assert data["fine_amount"].startswith("R$ ")
+        assert data["days_overdue"] == 5
+        assert data["fine_amount"] == f"R$ {settings.DAILY_FINE * 5:.2f}"
 
     @pytest.mark.asyncio
     async def test_return_on_time_no_fine(
@@ -274,6 +278,7 @@ class TestReturnLoanWithFine:
         authenticated_user,
         create_book,
         db_session: AsyncSession,
+        frozen_time,
     ):
         book = await create_book()
         now = datetime.now(timezone.utc)
@@ -291,17 +296,16 @@ class TestReturnLoanWithFine:
         response = await client.post(f"/loans/{loan.id}/return")
         assert response.status_code == 200
         data = response.json()
-        assert data["days_overdue"] >= 1
-        assert data["fine_amount"].startswith("R$ ")
+        assert data["days_overdue"] == 1
+        assert data["fine_amount"] == f"R$ {settings.DAILY_FINE * 1:.2f}"
 
 
 class TestListLoans:
     @pytest.fixture
     async def loans_setup(
-        self, db_session: AsyncSession, authenticated_user, create_book
+        self, db_session: AsyncSession, authenticated_user, create_books
     ):
-        book1 = await create_book()
-        book2 = await create_book()
+        book1, book2 = await create_books(2)
 
         now = datetime.now(timezone.utc)
         active_loan = LoanFactory.build(user_id=authenticated_user.id, book_id=book1.id)
@@ -538,7 +542,24 @@ class TestExtendLoan:
         assert response.status_code == 403
 
 
+@pytest.mark.needs_postgres
 class TestConcurrentLoans:
+    @pytest.fixture
+    async def db_session(self, db_engine) -> AsyncGenerator[AsyncSession, None]:
+        # Requests concorrentes usam conexões próprias, então os dados do
+        # cenário precisam de commit real em vez do SAVEPOINT compartilhado.
+        session_factory = async_sessionmaker(
+            bind=db_engine, class_=AsyncSession, expire_on_commit=False
+        )
+        async with session_factory() as session:
+            yield session
+
+        async with db_engine.begin() as conn:
+            tables = ", ".join(
+                t.name for t in Base.metadata.sorted_tables if t.name != "users"
+            )
+            await conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY"))
+
     @pytest.mark.asyncio
     async def test_concurrent_loan_last_copy_pessimistic_lock(
         self,
@@ -548,6 +569,7 @@ class TestConcurrentLoans:
         redis_client_test,
     ):
         book = await create_book(total_copies=1, available_copies=1)
+        await db_session.commit()
 
         payload = {"user_id": authenticated_user.id, "book_id": book.id}
 
@@ -22,6 +22,7 @@ class TestNotificationsDispatch:
         authenticated_user,
         create_book,
         create_loan,
+        frozen_time,
     ):
         book = await create_book()
         now = datetime.now(timezone.utc)
@@ -45,4 +46,5 @@ class TestNotificationsDispatch:
         assert "due_soon_sent" in data
         assert "overdue_sent" in data
         assert data["total_sent"] == data["due_soon_sent"] + data["overdue_sent"]
-        assert data["total_sent"] >= 1
+        assert data["due_soon_sent"] == 2
+        assert data["overdue_sent"] == 2
@@ -1,29 +1,30 @@
 import pytest
+from datetime import timedelta
 from httpx import AsyncClient
 
+from app.core.config import settings
+
 
 class TestRateLimiting:
     @pytest.mark.asyncio
     async def test_rate_limit_loans_endpoint_allows_five_requests(
-        self, client: AsyncClient, create_book, create_user
+        self, client: AsyncClient, create_book, create_users
     ):
         book = await create_book(total_copies=100, available_copies=100)
-        user_ids = [(await create_user(email=f"rate{i}@test.com")).id for i in range(5)]
+        user_ids = [user.id for user in await create_users(5)]
 
         for idx in range(5):
             response = await client.post(
                 "/loans/", json={"user_id": user_ids[idx], "book_id": book.id}
             )
-            assert response.status_code != 429
+            assert response.status_code == 201
 
     @pytest.mark.asyncio
     async def test_rate_limit_loans_endpoint_blocks_sixth_request(
-        self, client: AsyncClient, create_book, create_user
+        self, client: AsyncClient, create_book, create_users
     ):
         book = await create_book(total_copies=100, available_copies=100)
-        user_ids = [
-            (await create_user(email=f"rate{i}@block.com")).id for i in range(6)
-        ]
+        user_ids = [user.id for user in await create_users(6)]
 
         for idx in range(5):
             await client.post(
@@ -45,10 +46,10 @@ class TestRateLimiting:
 
     @pytest.mark.asyncio
     async def test_rate_limit_per_user(
-        self, client: AsyncClient, create_book, create_user
+        self, client: AsyncClient, create_book, create_users
     ):
         book = await create_book(total_copies=100, available_copies=100)
-        user_ids = [(await create_user(email=f"rate{i}@per.com")).id for i in range(6)]
+        user_ids = [user.id for user in await create_users(6)]
 
         for idx in range(5):
             await client.post(
@@ -61,10 +62,10 @@ class TestRateLimiting:
 
     @pytest.mark.asyncio
     async def test_rate_limit_returns_proper_error_message(
-        self, client: AsyncClient, create_book, create_user
+        self, client: AsyncClient, create_book, create_users
     ):
         book = await create_book(total_copies=100, available_copies=100)
-        user_ids = [(await create_user(email=f"rate{i}@msg.com")).id for i in range(6)]
+        user_ids = [user.id for user in await create_users(6)]
 
         for idx in range(5):
             await client.post(
@@ -75,3 +76,25 @@ class TestRateLimiting:
         )
         assert response.status_code == 429
         assert "detail" in response.json()
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_window_resets_after_expiry(
+        self, client: AsyncClient, create_book, create_users, frozen_time
+    ):
+        book = await create_book(total_copies=100, available_copies=100)
+        user_ids = [user.id for user in await create_users(7)]
+
+        for idx in range(5):
+            await client.post(
+                "/loans/", json={"user_id": user_ids[idx], "book_id": book.id}
+            )
+        response = await client.post(
+            "/loans/", json={"user_id": user_ids[5], "book_id": book.id}
+        )
+        assert response.status_code == 429
+
+        frozen_time.shift(timedelta(seconds=settings.RATE_LIMIT_SECONDS + 1))
+        response = await client.post(
+            "/loans/", json={"user_id": user_ids[6], "book_id": book.id}
+        )
+        assert response.status_code == 201
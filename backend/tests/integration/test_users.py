@@ -1,136 +1,109 @@
 import pytest
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
+from app.api.v1.routers.users import USERS_PDF_FILENAME
+from app.core.messages import ErrorMessages
+from app.domains.auth.security import get_password_hash
 from app.domains.loans.models import LoanStatus
+from app.domains.users.models import User
 from app.domains.users.schemas import UserRole
-from tests.factories import OverdueLoanFactory
+from app.main import app
+from tests._asserts import assert_user_response_shape
+from tests.factories import OverdueLoanFactory, UserFactory
+
+MISSING = object()
+
+VALID_USER_PAYLOAD = {
+    "name": "Test User",
+    "email": "testuser@example.com",
+    "password": "securepass123",
+}
+MIN_LENGTH_PASSWORD_PAYLOAD = {
+    "name": "Test User",
+    "email": "minpass@example.com",
+    "password": "123456",
+}
+MIXED_CASE_EMAIL_PAYLOAD = {
+    "name": "User One",
+    "email": "Test@Example.com",
+    "password": "pass123456",
+}
+LOWER_CASE_EMAIL_PAYLOAD = {
+    "name": "User Two",
+    "email": "test@example.com",
+    "password": "pass123456",
+}
+LONG_NAME_PAYLOAD = {
+    "name": "A" * 500,
+    "email": "longname@example.com",
+    "password": "pass123456",
+}
 
 
 class TestCreateUser:
     @pytest.fixture
     def valid_user_data(self):
-        return {
-            "name": "Test User",
-            "email": "testuser@example.com",
-            "password": "securepass123",
-        }
+        return VALID_USER_PAYLOAD
 
     @pytest.mark.asyncio
     async def test_create_user_success(self, client: AsyncClient, valid_user_data):
         response = await client.post("/users/", json=valid_user_data)
         assert response.status_code == 201
         data = response.json()
+        assert_user_response_shape(
+            data,
+            email=valid_user_data["email"],
+            role=UserRole.USER.value,
+            must_reset_password=False,
+        )
         assert data["name"] == valid_user_data["name"]
-        assert data["email"] == valid_user_data["email"]
-        assert data["role"] == UserRole.USER.value
         assert data["is_active"] is True
-        assert data["must_reset_password"] is False
-        assert "id" in data
-        assert "created_at" in data
-        assert "password" not in data
-        assert "hashed_password" not in data
 
     @pytest.mark.asyncio
     async def test_create_user_duplicate_email(
-        self, client: AsyncClient, valid_user_data
+        self, client: AsyncClient, valid_user_data, create_user
     ):
-        await client.post("/users/", json=valid_user_data)
+        await create_user(email=valid_user_data["email"])
         response = await client.post("/users/", json=valid_user_data)
         assert response.status_code == 400
         assert "Email já registrado" in response.json()["detail"]
 
     @pytest.mark.asyncio
-    async def test_create_user_missing_name(self, client: AsyncClient):
-        response = await client.post(
-            "/users/", json={"email": "test@example.com", "password": "pass123456"}
-        )
-        assert response.status_code == 422
-
-    @pytest.mark.asyncio
-    async def test_create_user_missing_email(self, client: AsyncClient):
-        response = await client.post(
-            "/users/", json={"name": "Test User", "password": "pass123456"}
-        )
-        assert response.status_code == 422
-
-    @pytest.mark.asyncio
-    async def test_create_user_missing_password(self, client: AsyncClient):
-        response = await client.post(
-            "/users/", json={"name": "Test User", "email": "test@example.com"}
-        )
-        assert response.status_code == 422
-
-    @pytest.mark.asyncio
-    async def test_create_user_invalid_email_format(self, client: AsyncClient):
-        response = await client.post(
-            "/users/",
-            json={
-                "name": "Test User",
-                "email": "invalid-email",
-                "password": "pass123456",
-            },
-        )
-        assert response.status_code == 422
-
-    @pytest.mark.asyncio
-    async def test_create_user_empty_name(self, client: AsyncClient):
-        response = await client.post(
-            "/users/",
-            json={"name": "", "email": "test@example.com", "password": "pass123456"},
-        )
-        assert response.status_code == 422
-
-    @pytest.mark.asyncio
-    async def test_create_user_short_password(self, client: AsyncClient):
-        response = await client.post(
-            "/users/",
-            json={
-                "name": "Test User",
-                "email": "test@example.com",
-                "password": "12345",
-            },
-        )
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            pytest.param({"name": MISSING}, id="missing_name"),
+            pytest.param({"email": MISSING}, id="missing_email"),
+            pytest.param({"password": MISSING}, id="missing_password"),
+            pytest.param({"email": "invalid-email"}, id="invalid_email_format"),
+            pytest.param({"name": ""}, id="empty_name"),
+            pytest.param({"password": "12345"}, id="short_password"),
+        ],
+    )
+    async def test_create_user_invalid_payload(
+        self, client: AsyncClient, valid_user_data, overrides
+    ):
+        payload = {**valid_user_data, **overrides}
+        payload = {key: value for key, value in payload.items() if value is not MISSING}
+        response = await client.post("/users/", json=payload)
         assert response.status_code == 422
 
     @pytest.mark.asyncio
     async def test_create_user_password_exactly_min_length(self, client: AsyncClient):
-        response = await client.post(
-            "/users/",
-            json={
-                "name": "Test User",
-                "email": "minpass@example.com",
-                "password": "123456",
-            },
-        )
+        response = await client.post("/users/", json=MIN_LENGTH_PASSWORD_PAYLOAD)
         assert response.status_code == 201
 
     @pytest.mark.asyncio
     async def test_create_user_email_case_insensitive(self, client: AsyncClient):
-        data1 = {
-            "name": "User One",
-            "email": "Test@Example.com",
-            "password": "pass123456",
-        }
-        data2 = {
-            "name": "User Two",
-            "email": "test@example.com",
-            "password": "pass123456",
-        }
-        await client.post("/users/", json=data1)
-        response = await client.post("/users/", json=data2)
+        await client.post("/users/", json=MIXED_CASE_EMAIL_PAYLOAD)
+        response = await client.post("/users/", json=LOWER_CASE_EMAIL_PAYLOAD)
         assert response.status_code in [201, 400]
 
     @pytest.mark.asyncio
     async def test_create_user_long_name(self, client: AsyncClient):
-        response = await client.post(
-            "/users/",
-            json={
-                "name": "A" * 500,
-                "email": "longname@example.com",
-                "password": "pass123456",
-            },
-        )
+        response = await client.post("/users/", json=LONG_NAME_PAYLOAD)
         assert response.status_code == 201
 
 
@@ -141,11 +114,9 @@ class TestGetUser:
         response = await client.get(f"/users/{user.id}")
         assert response.status_code == 200
         data = response.json()
+        assert_user_response_shape(data, email=user.email)
         assert data["id"] == user.id
         assert data["name"] == user.name
-        assert data["email"] == user.email
-        assert "password" not in data
-        assert "hashed_password" not in data
 
     @pytest.mark.asyncio
     async def test_get_user_not_found(self, client: AsyncClient):
@@ -171,6 +142,28 @@ class TestGetUser:
         assert "created_at" in response.json()
 
 
+def _committed_user_count(created_users, seeded_user_ids) -> int:
+    """Usuários gravados fora da transação do teste: os do módulo e os semeados."""
+    return len(created_users) + len(seeded_user_ids)
+
+
+@pytest.fixture(scope="module")
+async def fifteen_users(db_engine: AsyncEngine, seeded_user_ids):
+    # Gravados uma vez para todos os testes de paginação do módulo, fora da
+    # transação de cada teste, e removidos ao final.
+    users = UserFactory.build_batch(
+        15, hashed_password=get_password_hash("password123")
+    )
+    async with AsyncSession(bind=db_engine, expire_on_commit=False) as session:
+        session.add_all(users)
+        await session.commit()
+
+    yield users
+
+    async with db_engine.begin() as conn:
+        await conn.execute(delete(User).where(User.id.in_([u.id for u in users])))
+
+
 class TestListUsers:
     @pytest.mark.asyncio
     async def test_list_users_includes_authenticated_user(
@@ -183,108 +176,111 @@ class TestListUsers:
 
     @pytest.mark.asyncio
     async def test_list_users_default_pagination(
-        self, client: AsyncClient, create_user
+        self, client: AsyncClient, fifteen_users
     ):
-        for i in range(15):
-            await create_user(email=f"user{i}@pagination.com")
         response = await client.get("/users/")
         assert response.status_code == 200
         assert len(response.json()) == 10
 
     @pytest.mark.asyncio
-    async def test_list_users_custom_limit(self, client: AsyncClient, create_user):
-        for i in range(15):
-            await create_user(email=f"user{i}@limit.com")
+    async def test_list_users_custom_limit(self, client: AsyncClient, fifteen_users):
         response = await client.get("/users/?limit=5")
         assert response.status_code == 200
         assert len(response.json()) == 5
 
     @pytest.mark.asyncio
-    async def test_list_users_custom_skip(self, client: AsyncClient, create_user):
-        for i in range(15):
-            await create_user(email=f"user{i}@skip.com")
+    async def test_list_users_custom_skip(
+        self, client: AsyncClient, fifteen_users, seeded_user_ids
+    ):
         response = await client.get("/users/?skip=10")
         assert response.status_code == 200
-        assert len(response.json()) <= 6
+        expected = _committed_user_count(fifteen_users, seeded_user_ids) - 10
+        assert len(response.json()) == expected
 
     @pytest.mark.asyncio
-    async def test_list_users_skip_and_limit(self, client: AsyncClient, create_user):
-        for i in range(15):
-            await create_user(email=f"user{i}@skipandlimit.com")
+    async def test_list_users_skip_and_limit(self, client: AsyncClient, fifteen_users):
         response = await client.get("/users/?skip=5&limit=3")
         assert response.status_code == 200
         assert len(response.json()) == 3
 
     @pytest.mark.asyncio
-    async def test_list_users_skip_beyond_total(self, client: AsyncClient, create_user):
-        for i in range(15):
-            await create_user(email=f"user{i}@beyond.com")
+    async def test_list_users_skip_beyond_total(
+        self, client: AsyncClient, fifteen_users
+    ):
         response = await client.get("/users/?skip=100")
         assert response.status_code == 200
         assert len(response.json()) == 0
 
+    @pytest.mark.asyncio
+    async def test_list_users_keyset_pagination(
+        self, client: AsyncClient, fifteen_users, seeded_user_ids
+    ):
+        seen_ids = []
+        after_id = 0
+        while True:
+            response = await client.get(f"/users/?after_id={after_id}&limit=4")
+            assert response.status_code == 200
+            page = [user["id"] for user in response.json()]
+            if not page:
+                break
+            assert page == sorted(page)
+            seen_ids.extend(page)
+            after_id = page[-1]
+
+        assert seen_ids == sorted(set(seen_ids))
+        assert len(seen_ids) == _committed_user_count(fifteen_users, seeded_user_ids)
+
+    @pytest.mark.asyncio
+    async def test_list_users_rejects_skip_with_after_id(self, client: AsyncClient):
+        response = await client.get("/users/?skip=10&after_id=5")
+        assert response.status_code == 422
+        assert response.json()["detail"] == ErrorMessages.USER_LIST_SKIP_WITH_AFTER_ID
+
     @pytest.mark.asyncio
     async def test_list_users_no_password_in_response(
-        self, client: AsyncClient, create_user
+        self, client: AsyncClient, create_users
     ):
-        for i in range(5):
-            await create_user(email=f"user{i}@nopass.com")
+        await create_users(5)
         response = await client.get("/users/")
         assert response.status_code == 200
         for user in response.json():
-            assert "password" not in user
-            assert "hashed_password" not in user
+            assert_user_response_shape(user)
 
 
-class TestUserAuthentication:
-    @pytest.mark.asyncio
-    async def test_list_users_requires_authentication(
-        self, client_unauthenticated: AsyncClient
-    ):
-        response = await client_unauthenticated.get("/users/")
-        assert response.status_code == 401
+NEW_USER_PAYLOAD = {
+    "name": "Public User",
+    "email": "public@example.com",
+    "password": "password123",
+}
 
-    @pytest.mark.asyncio
-    async def test_list_users_requires_admin_role(self, client_user: AsyncClient):
-        response = await client_user.get("/users/")
-        assert response.status_code == 403
+PROTECTED_USER_ENDPOINTS = [
+    pytest.param("GET", "/users/", id="list"),
+    pytest.param("GET", "/users/1", id="get"),
+    pytest.param("POST", "/users/", id="create"),
+]
 
-    @pytest.mark.asyncio
-    async def test_get_user_requires_authentication(
-        self, client_unauthenticated: AsyncClient
-    ):
-        response = await client_unauthenticated.get("/users/1")
-        assert response.status_code == 401
 
-    @pytest.mark.asyncio
-    async def test_get_user_requires_admin_role(self, client_user: AsyncClient):
-        response = await client_user.get("/users/1")
-        assert response.status_code == 403
+async def _request(client: AsyncClient, method: str, path: str):
+    if method == "POST":
+        return await client.post(path, json=NEW_USER_PAYLOAD)
+    return await client.request(method, path)
 
+
+class TestUserAuthentication:
     @pytest.mark.asyncio
-    async def test_create_user_does_not_require_authentication(
-        self, client_unauthenticated: AsyncClient
+    @pytest.mark.parametrize("method,path", PROTECTED_USER_ENDPOINTS)
+    async def test_requires_authentication(
+        self, client_unauthenticated: AsyncClient, method: str, path: str
     ):
-        response = await client_unauthenticated.post(
-            "/users/",
-            json={
-                "name": "Public User",
-                "email": "public@example.com",
-                "password": "password123",
-            },
-        )
+        response = await _request(client_unauthenticated, method, path)
         assert response.status_code == 401
 
     @pytest.mark.asyncio
-    async def test_create_user_requires_admin_role(self, client_user: AsyncClient):
-        response = await client_user.post(
-            "/users/",
-            json={
-                "name": "Non Admin",
-                "email": "nonadmin@example.com",
-                "password": "password123",
-            },
-        )
+    @pytest.mark.parametrize("method,path", PROTECTED_USER_ENDPOINTS)
+    async def test_requires_admin_role(
+        self, client_user: AsyncClient, method: str, path: str
+    ):
+        response = await _request(client_user, method, path)
         assert response.status_code == 403
 
 
@@ -293,12 +289,11 @@ class TestListUserLoans:
     async def test_list_user_loans_success(
         self,
         client: AsyncClient,
-        create_user,
+        create_users,
         create_book,
         create_loan,
     ):
-        user = await create_user(email="loans@example.com")
-        other_user = await create_user(email="otherloans@example.com")
+        user, other_user = await create_users(2)
         book = await create_book()
 
         await create_loan(user_id=user.id, book_id=book.id)
@@ -411,9 +406,8 @@ class TestUserAdminActions:
         assert any(user["email"] == "alice@example.com" for user in results)
 
     @pytest.mark.asyncio
-    async def test_lookup_users_by_ids(self, client: AsyncClient, create_user):
-        user1 = await create_user(email="idlookup1@example.com")
-        user2 = await create_user(email="idlookup2@example.com")
+    async def test_lookup_users_by_ids(self, client: AsyncClient, create_users):
+        user1, user2 = await create_users(2)
         response = await client.get(f"/users/lookup/ids?ids={user1.id}&ids={user2.id}")
         assert response.status_code == 200
         results = response.json()
@@ -423,10 +417,33 @@ class TestUserAdminActions:
 
     @pytest.mark.asyncio
     async def test_export_users_pdf_success(self, client: AsyncClient):
-        response = await client.get("/users/export/pdf")
+        response = await client.head("/users/export/pdf")
         assert response.status_code == 200
         assert response.headers["content-type"] == "application/pdf"
-        assert "attachment" in response.headers.get("content-disposition", "")
+        assert response.headers["content-disposition"] == (
+            f'attachment; filename="{USERS_PDF_FILENAME}"'
+        )
+
+    @pytest.mark.asyncio
+    async def test_export_users_pdf_renders_document(self, client: AsyncClient):
+        response = await client.get("/users/export/pdf")
+        assert response.status_code == 200
+        assert response.content.startswith(b"%PDF")
+        head = await client.head("/users/export/pdf")
+        assert (
+            response.headers["content-disposition"]
+            == head.headers["content-disposition"]
+        )
+
+    def test_export_users_pdf_has_single_openapi_operation(self):
+        paths = app.openapi()["paths"]
+        assert list(paths["/users/export/pdf"]) == ["get"]
+        operation_ids = [
+            operation["operationId"]
+            for operations in paths.values()
+            for operation in operations.values()
+        ]
+        assert len(operation_ids) == len(set(operation_ids))
 
     @pytest.mark.asyncio
     async def test_export_users_pdf_requires_auth(
@@ -0,0 +1,107 @@
+import inspect
+from types import SimpleNamespace
+from typing import Any
+
+
+class AsyncStub:
+    """
+    Substituto enxuto do AsyncMock para dependências assíncronas dos serviços.
+
+    Só registra as chamadas e devolve ``return_value`` (ou aplica
+    ``side_effect``), sem a introspecção e os objetos ``call`` do
+    ``unittest.mock``. Expõe o subconjunto da API do AsyncMock que os testes
+    unitários usam.
+    """
+
+    def __init__(self, return_value: Any = None, side_effect: Any = None):
+        self.return_value = return_value
+        self.side_effect = side_effect
+        self.calls: list[tuple[tuple[Any, ...], dict[str, Any]]] = []
+
+    @property
+    def side_effect(self) -> Any:
+        return self._side_effect
+
+    @side_effect.setter
+    def side_effect(self, effect: Any) -> None:
+        # Como no Mock: um iterável vira a sequência de retornos das chamadas
+        if effect is not None and not callable(effect) and not isinstance(
+            effect, BaseException
+        ):
+            effect = iter(effect)
+        self._side_effect = effect
+
+    async def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        self.calls.append((args, kwargs))
+        effect = self._side_effect
+        if effect is None:
+            return self.return_value
+        if isinstance(effect, BaseException) or (
+            isinstance(effect, type) and issubclass(effect, BaseException)
+        ):
+            raise effect
+        if callable(effect):
+            return effect(*args, **kwargs)
+        return next(effect)
+
+    @property
+    def await_count(self) -> int:
+        return len(self.calls)
+
+    @property
+    def called(self) -> bool:
+        return bool(self.calls)
+
+    @property
+    def call_args(self) -> tuple[tuple[Any, ...], dict[str, Any]] | None:
+        return self.calls[-1] if self.calls else None
+
+    def reset_mock(self, return_value: bool = False, side_effect: bool = False) -> None:
+        self.calls.clear()
+        if return_value:
+            self.return_value = None
+        if side_effect:
+            self.side_effect = None
+
+    def assert_awaited_once(self) -> None:
+        assert self.await_count == 1, f"esperado 1 await, houve {self.await_count}"
+
+    def assert_awaited_once_with(self, *args: Any, **kwargs: Any) -> None:
+        self.assert_awaited_once()
+        assert self.calls[0] == (args, kwargs), self.calls[0]
+
+    def assert_not_awaited(self) -> None:
+        assert not self.calls, f"esperado nenhum await, houve {self.await_count}"
+
+
+def stub_async_methods(spec: type, *names: str) -> SimpleNamespace:
+    """
+    Dublê com um ``AsyncStub`` por método, restrito aos métodos ``async`` de ``spec``.
+
+    Faz o papel do ``spec_set`` do ``create_autospec``: um nome digitado errado
+    ou um método renomeado no repositório falha na montagem do fixture.
+    """
+    invalid = [
+        name
+        for name in names
+        if not inspect.iscoroutinefunction(getattr(spec, name, None))
+    ]
+    assert not invalid, f"{spec.__name__} não tem métodos async: {invalid}"
+    return SimpleNamespace(**{name: AsyncStub() for name in names})
+
+
+class _EmptyAsyncIterator:
+    """``Redis.scan_iter`` sem chaves: chamável que devolve a si mesmo, já esgotado."""
+
+    def __call__(self, match: str | None = None) -> "_EmptyAsyncIterator":
+        return self
+
+    def __aiter__(self) -> "_EmptyAsyncIterator":
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+
+# Sem estado: a mesma instância serve para todos os fixtures de Redis.
+empty_scan_iter = _EmptyAsyncIterator()
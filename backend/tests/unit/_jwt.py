@@ -0,0 +1,3 @@
+# Chave HS256 dos testes unitários de JWT; o fixture ``jwt_settings`` do
+# conftest a instala em ``settings`` e os testes a usam para assinar tokens.
+TEST_SECRET_KEY = "test_secret_key_with_minimum_32_bytes_for_hs256"
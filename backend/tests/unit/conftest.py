@@ -0,0 +1,13 @@
+import pytest
+
+from app.core.config import settings
+from tests.unit._jwt import TEST_SECRET_KEY
+
+
+@pytest.fixture(scope="module")
+def jwt_settings():
+    """Chave e algoritmo de JWT conhecidos, aplicados uma vez por módulo."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(settings, "SECRET_KEY", TEST_SECRET_KEY)
+        mp.setattr(settings, "ALGORITHM", "HS256")
+        yield
@@ -1,8 +1,10 @@
 from decimal import Decimal
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from app.domains.analytics.repository import SummaryScalars
 from app.domains.analytics.services import AnalyticsService
 
 
@@ -11,13 +13,17 @@ class TestAnalyticsService:
     async def test_get_dashboard_summary(self):
         service = AnalyticsService(db=MagicMock())
         service.repository = MagicMock()
-        service.repository.count_total_books = AsyncMock(return_value=5)
-        service.repository.count_total_users = AsyncMock(return_value=3)
-        service.repository.count_active_loans = AsyncMock(return_value=2)
-        service.repository.count_overdue_loans = AsyncMock(return_value=1)
-        service.repository.sum_total_fines = AsyncMock(return_value=Decimal("10.00"))
+        service.repository.fetch_summary_scalars = AsyncMock(
+            return_value=SummaryScalars(
+                total_books=5,
+                total_users=3,
+                active_loans=2,
+                overdue_loans=1,
+                total_fines=Decimal("10.00"),
+            )
+        )
 
-        recent_book = MagicMock(
+        recent_book = SimpleNamespace(
             id=1,
             title="Book",
             author="Author",
@@ -37,5 +43,14 @@ class TestAnalyticsService:
         assert summary.active_loans == 2
         assert summary.overdue_loans == 1
         assert summary.total_fines == Decimal("10.00")
-        assert summary.recent_books[0]["title"] == "Book"
+        assert summary.recent_books == [
+            {
+                "id": 1,
+                "title": "Book",
+                "author": "Author",
+                "isbn": "ISBN",
+                "total_copies": 2,
+                "available_copies": 1,
+            }
+        ]
         assert summary.most_borrowed_books[0].loan_count == 7
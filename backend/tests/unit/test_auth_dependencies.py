@@ -1,26 +1,92 @@
+import copy
 import pytest
 from datetime import datetime, timedelta, timezone
-from unittest.mock import AsyncMock, MagicMock, patch
+from functools import lru_cache
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 from fastapi import HTTPException, status
 import jwt
 
-from app.domains.auth.dependencies import get_current_user
-from app.domains.users.models import User
+from app.domains.auth import dependencies
+from app.domains.auth.dependencies import _USER_BY_EMAIL_STMT, get_current_user
+from tests.unit._jwt import TEST_SECRET_KEY
+
+pytestmark = pytest.mark.usefixtures("jwt_settings")
 
-TEST_SECRET_KEY = "test_secret_key_with_minimum_32_bytes_for_hs256"
 WRONG_SECRET_KEY = "wrong_secret_key_with_minimum_32_bytes"
 
+VALID_TOKEN = jwt.encode(
+    {"sub": "test@example.com"}, TEST_SECRET_KEY, algorithm="HS256"
+)
+WRONG_SECRET_TOKEN = jwt.encode(
+    {"sub": "test@example.com"}, WRONG_SECRET_KEY, algorithm="HS256"
+)
+MISSING_SUB_TOKEN = jwt.encode({"user_id": 123}, TEST_SECRET_KEY, algorithm="HS256")
+NONE_SUB_TOKEN = jwt.encode({"sub": None}, TEST_SECRET_KEY, algorithm="HS256")
+UNKNOWN_USER_TOKEN = jwt.encode(
+    {"sub": "nonexistent@example.com"}, TEST_SECRET_KEY, algorithm="HS256"
+)
+EXPIRED_TOKEN = jwt.encode(
+    {"sub": "test@example.com", "exp": datetime(2020, 1, 1, tzinfo=timezone.utc)},
+    TEST_SECRET_KEY,
+    algorithm="HS256",
+)
+
+# Instante da redefinição de senha nos testes de ``iat``; anterior ao
+# FROZEN_NOW do conftest, para que nenhum ``iat`` fique no futuro.
+_PASSWORD_RESET_AT = datetime(2024, 1, 15, 11, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="module")
+def iat_tokens() -> dict[str, str]:
+    """Tokens emitidos meia hora antes e depois de ``_PASSWORD_RESET_AT``."""
+    return {
+        name: jwt.encode(
+            {
+                "sub": "test@example.com",
+                "iat": int((_PASSWORD_RESET_AT + delta).timestamp()),
+            },
+            TEST_SECRET_KEY,
+            algorithm="HS256",
+        )
+        for name, delta in (
+            ("before_reset", -timedelta(minutes=30)),
+            ("after_reset", timedelta(minutes=30)),
+        )
+    }
+
 
-def _make_mock_request(path: str = "/users/me") -> MagicMock:
-    """Helper to create a mock Request with the given URL path."""
-    request = MagicMock()
-    url = MagicMock()
-    url.path = path
-    request.url = url
-    return request
+# get_current_user só lê atributos do usuário; um SimpleNamespace evita a
+# instrumentação do modelo SQLAlchemy a cada teste.
+_BASE_USER = SimpleNamespace(
+    id=1,
+    name="Test User",
+    email="test@example.com",
+    hashed_password="hashed",
+    is_active=True,
+    must_reset_password=False,
+    password_reset_at=None,
+)
+
+
+def _scalar_result(value):
+    """Resultado de ``db.execute`` cujo ``scalar_one_or_none()`` devolve ``value``."""
+    return SimpleNamespace(scalar_one_or_none=lambda: value)
+
+
+@lru_cache(maxsize=None)
+def _make_mock_request(path: str = "/users/me") -> SimpleNamespace:
+    """Request mínimo com apenas ``url.path`` (único atributo lido), cacheado por path."""
+    return SimpleNamespace(url=SimpleNamespace(path=path))
 
 
 class TestGetCurrentUser:
+    @pytest.fixture(autouse=True)
+    def clear_token_cache(self):
+        dependencies._DECODED_TOKEN_CACHE.clear()
+        yield
+        dependencies._DECODED_TOKEN_CACHE.clear()
+
     @pytest.fixture
     def mock_db_session(self):
         session = AsyncMock()
@@ -35,102 +101,89 @@ class TestGetCurrentUser:
 
     @pytest.fixture
     def sample_user(self):
-        return User(
-            id=1,
-            name="Test User",
-            email="test@example.com",
-            hashed_password="hashed",
-            is_active=True,
-        )
+        return copy.copy(_BASE_USER)
 
     @pytest.mark.asyncio
-    @patch("app.domains.auth.dependencies.settings")
     async def test_get_current_user_valid_token(
-        self, mock_settings, mock_db_session, mock_redis, sample_user
+        self, mock_db_session, mock_redis, sample_user
     ):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
+        token = VALID_TOKEN
 
-        token = jwt.encode(
-            {"sub": "test@example.com"}, TEST_SECRET_KEY, algorithm="HS256"
-        )
-
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_user
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.execute.return_value = _scalar_result(sample_user)
 
         request = _make_mock_request()
         user = await get_current_user(request=request, token=token, db=mock_db_session, redis=mock_redis)
 
         assert user.email == "test@example.com"
         assert user.id == 1
+        mock_db_session.execute.assert_awaited_once_with(
+            _USER_BY_EMAIL_STMT, {"email": "test@example.com"}
+        )
 
     @pytest.mark.asyncio
-    @patch("app.domains.auth.dependencies.settings")
-    async def test_get_current_user_invalid_token_raises_401(
-        self, mock_settings, mock_db_session, mock_redis
+    async def test_get_current_user_reuses_decoded_token(
+        self, mock_db_session, mock_redis, sample_user
     ):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
-
-        token = "invalid.token.here"
-
+        mock_db_session.execute.return_value = _scalar_result(sample_user)
         request = _make_mock_request()
-        with pytest.raises(HTTPException) as exc:
-            await get_current_user(request=request, token=token, db=mock_db_session, redis=mock_redis)
-
-        assert exc.value.status_code == status.HTTP_401_UNAUTHORIZED
-        assert "Credenciais inválidas" in exc.value.detail
 
+        with patch.object(dependencies.jwt, "decode", wraps=jwt.decode) as decode_spy:
+            for _ in range(2):
+                await get_current_user(
+                    request=request, token=VALID_TOKEN, db=mock_db_session, redis=mock_redis
+                )
+
+        decode_spy.assert_called_once()
+        assert mock_redis.exists.await_count == 2
+
+    @pytest.mark.parametrize(
+        "token",
+        [
+            pytest.param("invalid.token.here", id="malformed"),
+            pytest.param("invalid.token", id="two-segments"),
+            pytest.param("", id="empty"),
+            pytest.param(WRONG_SECRET_TOKEN, id="wrong-secret"),
+            pytest.param(EXPIRED_TOKEN, id="expired"),
+            pytest.param(MISSING_SUB_TOKEN, id="missing-sub"),
+            pytest.param(NONE_SUB_TOKEN, id="none-sub"),
+        ],
+    )
     @pytest.mark.asyncio
-    @patch("app.domains.auth.dependencies.settings")
-    async def test_get_current_user_token_wrong_secret_raises_401(
-        self, mock_settings, mock_db_session, mock_redis
+    async def test_get_current_user_rejects_bad_token(
+        self, token, mock_db_session, mock_redis
     ):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
-
-        token = jwt.encode(
-            {"sub": "test@example.com"}, WRONG_SECRET_KEY, algorithm="HS256"
-        )
-
         request = _make_mock_request()
         with pytest.raises(HTTPException) as exc:
             await get_current_user(request=request, token=token, db=mock_db_session, redis=mock_redis)
 
         assert exc.value.status_code == status.HTTP_401_UNAUTHORIZED
+        assert "Credenciais inválidas" in exc.value.detail
+        assert exc.value.headers == {"WWW-Authenticate": "Bearer"}
+        mock_db_session.execute.assert_not_awaited()
 
+    @pytest.mark.parametrize("token", ["", "   ", "invalid.token", "a.b.c.d"])
     @pytest.mark.asyncio
-    @patch("app.domains.auth.dependencies.settings")
-    async def test_get_current_user_token_missing_sub_raises_401(
-        self, mock_settings, mock_db_session, mock_redis
+    async def test_get_current_user_malformed_token_skips_decode(
+        self, token, mock_db_session, mock_redis
     ):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
-
-        token = jwt.encode({"user_id": 123}, TEST_SECRET_KEY, algorithm="HS256")
-
         request = _make_mock_request()
-        with pytest.raises(HTTPException) as exc:
-            await get_current_user(request=request, token=token, db=mock_db_session, redis=mock_redis)
+        with patch.object(dependencies.jwt, "decode") as decode_spy:
+            with pytest.raises(HTTPException) as exc:
+                await get_current_user(
+                    request=request, token=token, db=mock_db_session, redis=mock_redis
+                )
 
         assert exc.value.status_code == status.HTTP_401_UNAUTHORIZED
+        decode_spy.assert_not_called()
+        mock_redis.exists.assert_not_awaited()
 
     @pytest.mark.asyncio
-    @patch("app.domains.auth.dependencies.settings")
     async def test_get_current_user_user_not_found_raises_401(
-        self, mock_settings, mock_db_session, mock_redis
+        self, mock_db_session, mock_redis
     ):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
-
-        token = jwt.encode(
-            {"sub": "nonexistent@example.com"}, TEST_SECRET_KEY, algorithm="HS256"
-        )
+        token = UNKNOWN_USER_TOKEN
 
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.execute.return_value = _scalar_result(None)
 
         request = _make_mock_request()
         with pytest.raises(HTTPException) as exc:
@@ -139,22 +192,14 @@ class TestGetCurrentUser:
         assert exc.value.status_code == status.HTTP_401_UNAUTHORIZED
 
     @pytest.mark.asyncio
-    @patch("app.domains.auth.dependencies.settings")
     async def test_get_current_user_inactive_user_raises_403(
-        self, mock_settings, mock_db_session, mock_redis, sample_user
+        self, mock_db_session, mock_redis, sample_user
     ):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
-
         sample_user.is_active = False
 
-        token = jwt.encode(
-            {"sub": "test@example.com"}, TEST_SECRET_KEY, algorithm="HS256"
-        )
+        token = VALID_TOKEN
 
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_user
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.execute.return_value = _scalar_result(sample_user)
 
         request = _make_mock_request()
         with pytest.raises(HTTPException) as exc:
@@ -163,97 +208,14 @@ class TestGetCurrentUser:
         assert exc.value.status_code == status.HTTP_403_FORBIDDEN
 
     @pytest.mark.asyncio
-    @patch("app.domains.auth.dependencies.settings")
-    async def test_get_current_user_expired_token_raises_401(
-        self, mock_settings, mock_db_session, mock_redis
-    ):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
-
-        from datetime import datetime, timedelta, timezone
-
-        expired_time = datetime.now(timezone.utc) - timedelta(hours=1)
-        token = jwt.encode(
-            {"sub": "test@example.com", "exp": expired_time},
-            TEST_SECRET_KEY,
-            algorithm="HS256",
-        )
-
-        request = _make_mock_request()
-        with pytest.raises(HTTPException) as exc:
-            await get_current_user(request=request, token=token, db=mock_db_session, redis=mock_redis)
-
-        assert exc.value.status_code == status.HTTP_401_UNAUTHORIZED
-
-    @pytest.mark.asyncio
-    @patch("app.domains.auth.dependencies.settings")
-    async def test_get_current_user_empty_token_raises_401(
-        self, mock_settings, mock_db_session, mock_redis
-    ):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
-
-        request = _make_mock_request()
-        with pytest.raises(HTTPException) as exc:
-            await get_current_user(request=request, token="", db=mock_db_session, redis=mock_redis)
-
-        assert exc.value.status_code == status.HTTP_401_UNAUTHORIZED
-
-    @pytest.mark.asyncio
-    @patch("app.domains.auth.dependencies.settings")
-    async def test_get_current_user_includes_www_authenticate_header(
-        self, mock_settings, mock_db_session, mock_redis
-    ):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
-
-        token = "invalid.token"
-
-        request = _make_mock_request()
-        with pytest.raises(HTTPException) as exc:
-            await get_current_user(request=request, token=token, db=mock_db_session, redis=mock_redis)
-
-        assert exc.value.headers is not None
-        assert exc.value.headers.get("WWW-Authenticate") == "Bearer"
-
-    @pytest.mark.asyncio
-    @patch("app.domains.auth.dependencies.settings")
-    async def test_get_current_user_token_with_none_sub_raises_401(
-        self, mock_settings, mock_db_session, mock_redis
-    ):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
-
-        token = jwt.encode({"sub": None}, TEST_SECRET_KEY, algorithm="HS256")
-
-        request = _make_mock_request()
-        with pytest.raises(HTTPException) as exc:
-            await get_current_user(request=request, token=token, db=mock_db_session, redis=mock_redis)
-
-        assert exc.value.status_code == status.HTTP_401_UNAUTHORIZED
-
-    @pytest.mark.asyncio
-    @patch("app.domains.auth.dependencies.settings")
     async def test_token_issued_before_password_reset_raises_401(
-        self, mock_settings, mock_db_session, mock_redis, sample_user
+        self, mock_db_session, mock_redis, sample_user, iat_tokens, frozen_time
     ):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
+        token = iat_tokens["before_reset"]
 
-        iat = datetime.now(timezone.utc) - timedelta(hours=1)
-        token = jwt.encode(
-            {"sub": "test@example.com", "iat": iat},
-            TEST_SECRET_KEY,
-            algorithm="HS256",
-        )
+        sample_user.password_reset_at = _PASSWORD_RESET_AT
 
-        sample_user.password_reset_at = datetime.now(timezone.utc) - timedelta(
-            minutes=30
-        )
-
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_user
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.execute.return_value = _scalar_result(sample_user)
 
         request = _make_mock_request()
         with pytest.raises(HTTPException) as exc:
@@ -262,25 +224,14 @@ class TestGetCurrentUser:
         assert exc.value.status_code == status.HTTP_401_UNAUTHORIZED
 
     @pytest.mark.asyncio
-    @patch("app.domains.auth.dependencies.settings")
     async def test_token_issued_after_password_reset_succeeds(
-        self, mock_settings, mock_db_session, mock_redis, sample_user
+        self, mock_db_session, mock_redis, sample_user, iat_tokens, frozen_time
     ):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
+        sample_user.password_reset_at = _PASSWORD_RESET_AT
 
-        sample_user.password_reset_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        token = iat_tokens["after_reset"]
 
-        iat = datetime.now(timezone.utc) - timedelta(minutes=30)
-        token = jwt.encode(
-            {"sub": "test@example.com", "iat": iat},
-            TEST_SECRET_KEY,
-            algorithm="HS256",
-        )
-
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_user
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.execute.return_value = _scalar_result(sample_user)
 
         request = _make_mock_request()
         user = await get_current_user(request=request, token=token, db=mock_db_session, redis=mock_redis)
@@ -288,24 +239,14 @@ class TestGetCurrentUser:
         assert user.email == "test@example.com"
 
     @pytest.mark.asyncio
-    @patch("app.domains.auth.dependencies.settings")
     async def test_must_reset_password_blocks_regular_routes(
-        self, mock_settings, mock_db_session, mock_redis, sample_user
+        self, mock_db_session, mock_redis, sample_user
     ):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
-
         sample_user.must_reset_password = True
 
-        token = jwt.encode(
-            {"sub": "test@example.com"},
-            TEST_SECRET_KEY,
-            algorithm="HS256",
-        )
+        token = VALID_TOKEN
 
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_user
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.execute.return_value = _scalar_result(sample_user)
 
         request = _make_mock_request("/books")
         with pytest.raises(HTTPException) as exc:
@@ -315,24 +256,14 @@ class TestGetCurrentUser:
         assert "redefinir a senha" in exc.value.detail
 
     @pytest.mark.asyncio
-    @patch("app.domains.auth.dependencies.settings")
     async def test_must_reset_password_allows_reset_endpoint(
-        self, mock_settings, mock_db_session, mock_redis, sample_user
+        self, mock_db_session, mock_redis, sample_user
     ):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
-
         sample_user.must_reset_password = True
 
-        token = jwt.encode(
-            {"sub": "test@example.com"},
-            TEST_SECRET_KEY,
-            algorithm="HS256",
-        )
+        token = VALID_TOKEN
 
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_user
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.execute.return_value = _scalar_result(sample_user)
 
         request = _make_mock_request("/users/me/reset-password")
         user = await get_current_user(request=request, token=token, db=mock_db_session, redis=mock_redis)
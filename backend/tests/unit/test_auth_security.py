@@ -1,5 +1,4 @@
 from datetime import datetime, timedelta, timezone
-from unittest.mock import patch
 import pytest
 import jwt
 
@@ -8,15 +7,29 @@ from app.domains.auth.security import (
     get_password_hash,
     create_access_token,
 )
+from tests.unit._jwt import TEST_SECRET_KEY
+
+CANONICAL_PASSWORDS = (
+    "mysecretpassword",
+    "correctpassword",
+    "somepassword",
+    "senhaçãoéê123",
+    "a" * 200,
+    "Password123",
+)
+
 
-TEST_SECRET_KEY = "test_secret_key_with_minimum_32_bytes_for_hs256"
+@pytest.fixture(scope="session")
+def password_hashes() -> dict[str, str]:
+    """Hash de cada senha canônica calculado uma única vez por sessão."""
+    return {password: get_password_hash(password) for password in CANONICAL_PASSWORDS}
 
 
 class TestPasswordHashing:
-    def test_get_password_hash_returns_hashed_string(self):
+    def test_get_password_hash_returns_hashed_string(self, password_hashes):
         password = "mysecretpassword"
 
-        hashed = get_password_hash(password)
+        hashed = password_hashes[password]
 
         assert hashed != password
         assert len(hashed) > 0
@@ -29,50 +42,45 @@ class TestPasswordHashing:
 
         assert hash1 != hash2
 
-    def test_verify_password_correct_password_returns_true(self):
+    def test_verify_password_correct_password_returns_true(self, password_hashes):
         password = "correctpassword"
-        hashed = get_password_hash(password)
+        hashed = password_hashes[password]
 
         result = verify_password(password, hashed)
 
         assert result is True
 
-    def test_verify_password_wrong_password_returns_false(self):
-        password = "correctpassword"
+    def test_verify_password_wrong_password_returns_false(self, password_hashes):
         wrong_password = "wrongpassword"
-        hashed = get_password_hash(password)
+        hashed = password_hashes["correctpassword"]
 
         result = verify_password(wrong_password, hashed)
 
         assert result is False
 
-    def test_verify_password_empty_password_returns_false(self):
-        password = "somepassword"
-        hashed = get_password_hash(password)
+    def test_verify_password_empty_password_returns_false(self, password_hashes):
+        hashed = password_hashes["somepassword"]
 
         result = verify_password("", hashed)
 
         assert result is False
 
-    def test_get_password_hash_handles_unicode(self):
+    def test_get_password_hash_handles_unicode(self, password_hashes):
         password = "senhaçãoéê123"
 
-        hashed = get_password_hash(password)
-        result = verify_password(password, hashed)
+        result = verify_password(password, password_hashes[password])
 
         assert result is True
 
-    def test_get_password_hash_handles_long_password(self):
+    def test_get_password_hash_handles_long_password(self, password_hashes):
         password = "a" * 200
 
-        hashed = get_password_hash(password)
-        result = verify_password(password, hashed)
+        result = verify_password(password, password_hashes[password])
 
         assert result is True
 
-    def test_verify_password_case_sensitive(self):
-        password = "Password123"
-        hashed = get_password_hash(password)
+    def test_verify_password_case_sensitive(self, password_hashes):
+        hashed = password_hashes["Password123"]
 
         result_lower = verify_password("password123", hashed)
         result_upper = verify_password("PASSWORD123", hashed)
@@ -81,11 +89,16 @@ class TestPasswordHashing:
         assert result_upper is False
 
 
+@pytest.fixture(scope="module")
+def default_token_claims(jwt_settings) -> dict:
+    """Claims de um token com expiração padrão, emitido uma vez por módulo."""
+    token = create_access_token({"sub": "test@example.com"})
+    return jwt.decode(token, options={"verify_signature": False})
+
+
+@pytest.mark.usefixtures("jwt_settings")
 class TestAccessToken:
-    @patch("app.domains.auth.security.settings")
-    def test_create_access_token_returns_valid_jwt(self, mock_settings):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
+    def test_create_access_token_returns_valid_jwt(self):
         data = {"sub": "test@example.com"}
 
         token = create_access_token(data)
@@ -93,74 +106,43 @@ class TestAccessToken:
         decoded = jwt.decode(token, TEST_SECRET_KEY, algorithms=["HS256"])
         assert decoded["sub"] == "test@example.com"
 
-    @patch("app.domains.auth.security.settings")
-    def test_create_access_token_includes_expiration(self, mock_settings):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
-        data = {"sub": "test@example.com"}
-
-        token = create_access_token(data)
+    def test_create_access_token_includes_expiration(self, default_token_claims):
+        assert "exp" in default_token_claims
 
-        decoded = jwt.decode(token, TEST_SECRET_KEY, algorithms=["HS256"])
-        assert "exp" in decoded
-
-    @patch("app.domains.auth.security.settings")
-    def test_create_access_token_with_custom_expiration(self, mock_settings):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
+    def test_create_access_token_with_custom_expiration(self):
         data = {"sub": "test@example.com"}
         expires_delta = timedelta(hours=2)
 
         token = create_access_token(data, expires_delta=expires_delta)
 
-        decoded = jwt.decode(token, TEST_SECRET_KEY, algorithms=["HS256"])
+        decoded = jwt.decode(token, options={"verify_signature": False})
         exp_time = datetime.fromtimestamp(decoded["exp"], tz=timezone.utc)
         expected_time = datetime.now(timezone.utc) + expires_delta
         assert abs((exp_time - expected_time).total_seconds()) < 5
 
-    @patch("app.domains.auth.security.settings")
-    def test_create_access_token_default_expiration_15_minutes(self, mock_settings):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
-        data = {"sub": "test@example.com"}
+    def test_create_access_token_default_expiration_15_minutes(
+        self, default_token_claims
+    ):
+        lifetime = default_token_claims["exp"] - default_token_claims["iat"]
 
-        token = create_access_token(data)
+        assert lifetime == timedelta(minutes=15).total_seconds()
 
-        decoded = jwt.decode(token, TEST_SECRET_KEY, algorithms=["HS256"])
-        exp_time = datetime.fromtimestamp(decoded["exp"], tz=timezone.utc)
-        expected_time = datetime.now(timezone.utc) + timedelta(minutes=15)
-        assert abs((exp_time - expected_time).total_seconds()) < 5
-
-    @patch("app.domains.auth.security.settings")
-    def test_create_access_token_preserves_additional_data(self, mock_settings):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
+    def test_create_access_token_preserves_additional_data(self):
         data = {"sub": "test@example.com", "role": "admin", "user_id": 123}
 
         token = create_access_token(data)
 
-        decoded = jwt.decode(token, TEST_SECRET_KEY, algorithms=["HS256"])
+        decoded = jwt.decode(token, options={"verify_signature": False})
         assert decoded["sub"] == "test@example.com"
         assert decoded["role"] == "admin"
         assert decoded["user_id"] == 123
 
-    @patch("app.domains.auth.security.settings")
-    def test_create_access_token_includes_iat_claim(self, mock_settings):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
-        data = {"sub": "test@example.com"}
-
-        token = create_access_token(data)
-
-        decoded = jwt.decode(token, TEST_SECRET_KEY, algorithms=["HS256"])
-        assert "iat" in decoded
-        iat_time = datetime.fromtimestamp(decoded["iat"], tz=timezone.utc)
+    def test_create_access_token_includes_iat_claim(self, default_token_claims):
+        assert "iat" in default_token_claims
+        iat_time = datetime.fromtimestamp(default_token_claims["iat"], tz=timezone.utc)
         assert abs((iat_time - datetime.now(timezone.utc)).total_seconds()) < 5
 
-    @patch("app.domains.auth.security.settings")
-    def test_create_access_token_does_not_modify_original_data(self, mock_settings):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
+    def test_create_access_token_does_not_modify_original_data(self):
         data = {"sub": "test@example.com"}
         original_data = data.copy()
 
@@ -170,28 +152,22 @@ class TestAccessToken:
         assert "exp" not in data
         assert "iat" not in data
 
-    @patch("app.domains.auth.security.settings")
-    def test_create_access_token_with_very_short_expiration(self, mock_settings):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
+    def test_create_access_token_with_very_short_expiration(self):
         data = {"sub": "test@example.com"}
         expires_delta = timedelta(seconds=1)
 
         token = create_access_token(data, expires_delta=expires_delta)
 
-        decoded = jwt.decode(token, TEST_SECRET_KEY, algorithms=["HS256"])
+        decoded = jwt.decode(token, options={"verify_signature": False})
         assert "exp" in decoded
 
-    @patch("app.domains.auth.security.settings")
-    def test_create_access_token_with_very_long_expiration(self, mock_settings):
-        mock_settings.SECRET_KEY = TEST_SECRET_KEY
-        mock_settings.ALGORITHM = "HS256"
+    def test_create_access_token_with_very_long_expiration(self):
         data = {"sub": "test@example.com"}
         expires_delta = timedelta(days=365)
 
         token = create_access_token(data, expires_delta=expires_delta)
 
-        decoded = jwt.decode(token, TEST_SECRET_KEY, algorithms=["HS256"])
+        decoded = jwt.decode(token, options={"verify_signature": False})
         exp_time = datetime.fromtimestamp(decoded["exp"], tz=timezone.utc)
         expected_time = datetime.now(timezone.utc) + expires_delta
         assert abs((exp_time - expected_time).total_seconds()) < 5
@@ -1,58 +1,83 @@
 import json
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
 from app.domains.books.models import Book
+from app.domains.books.repository import BookRepository
 from app.domains.books.schemas import BookCreate
 from app.domains.books.services import BookService
 from app.core.messages import ErrorMessages
+from tests.unit._async_stub import AsyncStub, empty_scan_iter, stub_async_methods
+
+SAMPLE_BOOK_CREATE = BookCreate(
+    title="Clean Code",
+    author="Robert Martin",
+    isbn="978-0132350884",
+    total_copies=5,
+)
+
+_CACHED_BOOKS = [
+    {
+        "id": 1,
+        "title": "Cached",
+        "author": "Author",
+        "isbn": "CACHE-001",
+        "total_copies": 2,
+        "available_copies": 2,
+    }
+]
+_CACHED_BOOKS_JSON = json.dumps(_CACHED_BOOKS)
+
+
+# Os testes só leem os atributos do livro; uma instância por módulo basta.
+@pytest.fixture(scope="module")
+def sample_book():
+    return Book(
+        id=1,
+        title="Clean Code",
+        author="Robert Martin",
+        isbn="978-0132350884",
+        total_copies=5,
+        available_copies=5,
+    )
 
 
 class TestBookServiceFixtures:
-    @pytest.fixture
-    def mock_db(self):
-        db = AsyncMock()
-        db.commit = AsyncMock()
-        db.refresh = AsyncMock()
-        db.flush = AsyncMock()
-        return db
-
-    @pytest.fixture
-    def mock_redis(self):
-        redis = MagicMock()
-        redis.get = AsyncMock(return_value=None)
-        redis.set = AsyncMock()
-        redis.delete = AsyncMock()
-
-        async def empty_scan_iter(match):
-            return
-            yield
+    # Stubs criados uma vez por classe e zerados antes de cada teste pelo
+    # fixture autouse abaixo.
+    @pytest.fixture(scope="class")
+    @classmethod
+    def mock_db(cls):
+        return SimpleNamespace(
+            commit=AsyncStub(), refresh=AsyncStub(), flush=AsyncStub()
+        )
 
-        redis.scan_iter = empty_scan_iter
-        return redis
+    @pytest.fixture(scope="class")
+    @classmethod
+    def mock_redis(cls):
+        return SimpleNamespace(get=AsyncStub(), set=AsyncStub(), delete=AsyncStub())
+
+    @pytest.fixture(autouse=True)
+    def reset_mocks(self, mock_db, mock_redis):
+        for stub in (
+            *vars(mock_db).values(),
+            mock_redis.get,
+            mock_redis.set,
+            mock_redis.delete,
+        ):
+            stub.reset_mock()
+        mock_redis.get.return_value = None
+        mock_redis.scan_iter = empty_scan_iter
 
     @pytest.fixture
     def service(self, mock_db, mock_redis):
         service = BookService(db=mock_db, redis=mock_redis)
-        service.repository = MagicMock()
-        service.repository.find_by_isbn = AsyncMock()
-        service.repository.find_all = AsyncMock()
-        service.repository.find_by_id = AsyncMock()
-        service.repository.create = AsyncMock()
-        service.repository.update = AsyncMock()
-        return service
-
-    @pytest.fixture
-    def sample_book(self):
-        return Book(
-            id=1,
-            title="Clean Code",
-            author="Robert Martin",
-            isbn="978-0132350884",
-            total_copies=5,
-            available_copies=5,
+        service.repository = stub_async_methods(
+            BookRepository, "find_by_isbn", "find_all", "find_by_id", "create", "update"
         )
+        return service
 
 
 class TestCreateBook(TestBookServiceFixtures):
@@ -64,14 +89,7 @@ class TestCreateBook(TestBookServiceFixtures):
         with patch(
             "app.domains.books.services.AuditLogService.log_event", new=AsyncMock()
         ):
-            book = await service.create_book(
-                BookCreate(
-                    title="Clean Code",
-                    author="Robert Martin",
-                    isbn="978-0132350884",
-                    total_copies=5,
-                )
-            )
+            book = await service.create_book(SAMPLE_BOOK_CREATE)
 
         assert book.title == "Clean Code"
         assert book.available_copies == 5
@@ -85,14 +103,7 @@ class TestCreateBook(TestBookServiceFixtures):
         service.repository.find_by_isbn.return_value = sample_book
 
         with pytest.raises(ValueError) as exc:
-            await service.create_book(
-                BookCreate(
-                    title="Clean Code",
-                    author="Robert Martin",
-                    isbn="978-0132350884",
-                    total_copies=5,
-                )
-            )
+            await service.create_book(SAMPLE_BOOK_CREATE)
 
         assert ErrorMessages.BOOK_ISBN_ALREADY_EXISTS in str(exc.value)
 
@@ -100,21 +111,11 @@ class TestCreateBook(TestBookServiceFixtures):
 class TestListBooks(TestBookServiceFixtures):
     @pytest.mark.asyncio
     async def test_list_books_cache_hit_returns_cached_data(self, service, mock_redis):
-        cached = [
-            {
-                "id": 1,
-                "title": "Cached",
-                "author": "Author",
-                "isbn": "CACHE-001",
-                "total_copies": 2,
-                "available_copies": 2,
-            }
-        ]
-        mock_redis.get.return_value = json.dumps(cached)
+        mock_redis.get.return_value = _CACHED_BOOKS_JSON
 
         result = await service.list_books(title=None, author=None, skip=0, limit=10)
 
-        assert result == cached
+        assert result == _CACHED_BOOKS
         service.repository.find_all.assert_not_awaited()
 
     @pytest.mark.asyncio
@@ -140,9 +141,8 @@ class TestListBooks(TestBookServiceFixtures):
 
         await service.list_books(title="Clean", author="Martin", skip=0, limit=10)
 
-        cache_key = mock_redis.set.call_args[0][0]
-        assert "Clean" in cache_key
-        assert "Martin" in cache_key
+        (cache_key, _), _ = mock_redis.set.calls[-1]
+        assert cache_key == "books:list:0:10:Clean:Martin"
 
 
 class TestGetBook(TestBookServiceFixtures):
@@ -155,14 +155,16 @@ class TestGetBook(TestBookServiceFixtures):
         assert book.id == 1
         assert book.title == "Clean Code"
 
+    @pytest.mark.parametrize("book_id", [999, 0, -1])
     @pytest.mark.asyncio
-    async def test_get_book_by_id_not_found(self, service):
+    async def test_get_book_by_id_not_found(self, service, book_id):
         service.repository.find_by_id.return_value = None
 
         with pytest.raises(LookupError) as exc:
-            await service.get_book_by_id(999)
+            await service.get_book_by_id(book_id)
 
         assert ErrorMessages.BOOK_NOT_FOUND in str(exc.value)
+        service.repository.find_by_id.assert_awaited_once_with(book_id)
 
 
 class TestInvalidateBooksCache(TestBookServiceFixtures):
@@ -1,118 +1,222 @@
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock, patch
+from itertools import chain, repeat
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 import pytest
 
 from app.core.config import settings
 from app.core.messages import ErrorMessages
 from app.domains.books.models import Book
+from app.domains.books.repository import BookRepository
 from app.domains.loans.models import Loan, LoanStatus
+from app.domains.loans.repository import LoanRepository
 from app.domains.loans.schemas import LoanCreate
 from app.domains.loans.services import LoanService
 from app.domains.users.models import User
+from app.domains.users.repository import UserRepository
+from tests.unit._async_stub import AsyncStub, empty_scan_iter, stub_async_methods
+
+_FIXED_NOW = datetime(2025, 1, 10, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _fixed_now() -> datetime:
+    return _FIXED_NOW
+
+
+# Deslocamentos de data usados pelos cenários, em dias
+_D1, _D3, _D5, _D7, _D10, _D14, _D20 = (
+    timedelta(days=n) for n in (1, 3, 5, 7, 10, 14, 20)
+)
+
+# Valores monetários dos cenários; Decimal é imutável, então são compartilhados
+_DEC_0, _DEC_2, _DEC_4, _DEC_10 = (
+    Decimal(v) for v in ("0.00", "2.00", "4.00", "10.00")
+)
+
+# Empréstimo ativo vencido há 5 dias. Os testes alteram o objeto (status,
+# multa), e ``copy.copy`` de uma instância mapeada compartilharia o
+# ``_sa_instance_state`` com o protótipo; por isso cada teste constrói o seu
+# a partir dos campos.
+_OVERDUE_LOAN_FIELDS = {
+    "id": 1,
+    "user_id": 1,
+    "book_id": 1,
+    "loan_date": _FIXED_NOW - _D20,
+    "expected_return_date": _FIXED_NOW - _D5,
+    "status": LoanStatus.ACTIVE,
+    "fine_amount": _DEC_0,
+}
+
+
+def _overdue_loan() -> Loan:
+    return Loan(**_OVERDUE_LOAN_FIELDS)
+
+
+async def _missing_in_stream(chunks, needles: set[str]) -> set[str]:
+    """Consome o stream e retorna os trechos que não aparecem em nenhum chunk."""
+    missing = set(needles)
+    async for chunk in chunks:
+        missing = {needle for needle in missing if needle not in chunk}
+    return missing
+
+
+# Objetos que o serviço só lê: uma instância por módulo.
+_LOAN_CREATE = LoanCreate(user_id=1, book_id=1)
+_SAMPLE_USER = User(
+    id=1,
+    name="Test User",
+    email="test@test.com",
+    hashed_password="hash",
+    is_active=True,
+)
+
+_SAMPLE_BOOK_FIELDS = {
+    "id": 1,
+    "title": "Test Book",
+    "author": "Author",
+    "isbn": "TEST-001",
+    "total_copies": 5,
+    "available_copies": 3,
+}
+_SAMPLE_BOOK_NO_COPIES_FIELDS = {
+    "id": 2,
+    "title": "Popular Book",
+    "author": "Author",
+    "isbn": "POP-001",
+    "total_copies": 5,
+    "available_copies": 0,
+}
+# Empréstimo ativo feito agora, com devolução prevista em 14 dias
+_ACTIVE_LOAN_FIELDS = {
+    "id": 1,
+    "user_id": 1,
+    "book_id": 1,
+    "loan_date": _FIXED_NOW,
+    "expected_return_date": _FIXED_NOW + _D14,
+    "status": LoanStatus.ACTIVE,
+    "fine_amount": _DEC_0,
+}
 
 
 class TestLoanServiceFixtures:
-    @pytest.fixture
-    def fixed_now(self):
-        return datetime(2025, 1, 10, 12, 0, 0, tzinfo=timezone.utc)
-
-    @pytest.fixture
-    def mock_db(self):
-        db = AsyncMock()
-        db.commit = AsyncMock()
-        db.refresh = AsyncMock()
-        db.flush = AsyncMock()
-        return db
-
-    @pytest.fixture
-    def mock_redis(self):
-        redis = MagicMock()
-        redis.delete = AsyncMock()
+    # O serviço e seus mocks são montados uma vez por classe; o fixture
+    # ``loan_service`` só zera chamadas e valores configurados a cada teste.
+    @pytest.fixture(scope="class")
+    @classmethod
+    def fixed_now(cls):
+        return _FIXED_NOW
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def mock_db(cls):
+        return SimpleNamespace(
+            commit=AsyncStub(), refresh=AsyncStub(), flush=AsyncStub()
+        )
 
-        async def empty_scan_iter(match):
-            return
-            yield
+    @pytest.fixture(scope="class")
+    @classmethod
+    def mock_redis(cls):
+        return SimpleNamespace(delete=AsyncStub(), scan_iter=empty_scan_iter)
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def loan_service_template(cls, mock_db, mock_redis):
+        service = LoanService(mock_db, mock_redis, get_now_fn=_fixed_now)
+        service.loan_repository = stub_async_methods(
+            LoanRepository,
+            "create",
+            "update",
+            "count_active_loans_by_user",
+            "find_overdue_loans_by_user",
+            "find_all",
+            "find_all_with_relations",
+            "find_by_id_with_lock",
+        )
+        service.book_repository = stub_async_methods(
+            BookRepository, "find_by_id_with_lock", "update"
+        )
+        service.user_repository = stub_async_methods(UserRepository, "find_by_id")
+        return service
 
-        redis.scan_iter = empty_scan_iter
-        return redis
+    @pytest.fixture(autouse=True)
+    def silence_audit(self, monkeypatch):
+        monkeypatch.setattr(
+            "app.domains.loans.services.AuditLogService.log_event", AsyncMock()
+        )
 
     @pytest.fixture
-    def loan_service(self, mock_db, mock_redis, fixed_now):
-        service = LoanService(mock_db, mock_redis, get_now_fn=lambda: fixed_now)
-        service.loan_repository = MagicMock()
-        service.book_repository = MagicMock()
-        service.user_repository = MagicMock()
-        service.loan_repository.create = AsyncMock()
-        service.loan_repository.update = AsyncMock()
-        service.loan_repository.count_active_loans_by_user = AsyncMock()
-        service.loan_repository.find_overdue_loans_by_user = AsyncMock()
-        service.loan_repository.find_all = AsyncMock()
-        service.loan_repository.find_all_with_relations = AsyncMock()
-        service.loan_repository.find_by_id_with_lock = AsyncMock()
-        service.book_repository.find_by_id_with_lock = AsyncMock()
-        service.book_repository.update = AsyncMock()
-        service.user_repository.find_by_id = AsyncMock()
-        return service
-
+    def loan_service(self, loan_service_template, mock_db, mock_redis):
+        for namespace in (
+            loan_service_template.loan_repository,
+            loan_service_template.book_repository,
+            loan_service_template.user_repository,
+            mock_db,
+        ):
+            for stub in vars(namespace).values():
+                stub.reset_mock(return_value=True, side_effect=True)
+        # Padrão: usuário sem empréstimos ativos nem atrasos (overdue já é None)
+        loan_repository = loan_service_template.loan_repository
+        loan_repository.count_active_loans_by_user.return_value = 0
+        mock_redis.delete.reset_mock()
+        mock_redis.scan_iter = empty_scan_iter
+        return loan_service_template
+
+    # Livros e empréstimos são alterados pelos testes (estoque, status,
+    # multa): continuam por teste, montados a partir dos campos do módulo.
     @pytest.fixture
     def sample_book(self):
-        return Book(
-            id=1,
-            title="Test Book",
-            author="Author",
-            isbn="TEST-001",
-            total_copies=5,
-            available_copies=3,
-        )
+        return Book(**_SAMPLE_BOOK_FIELDS)
 
     @pytest.fixture
     def sample_book_no_copies(self):
-        return Book(
-            id=2,
-            title="Popular Book",
-            author="Author",
-            isbn="POP-001",
-            total_copies=5,
-            available_copies=0,
-        )
+        return Book(**_SAMPLE_BOOK_NO_COPIES_FIELDS)
 
-    @pytest.fixture
-    def sample_user(self):
-        return User(
-            id=1,
-            name="Test User",
-            email="test@test.com",
-            hashed_password="hash",
-            is_active=True,
-        )
+    @pytest.fixture(scope="class")
+    @classmethod
+    def sample_user(cls):
+        return _SAMPLE_USER
 
-    @pytest.fixture
-    def sample_loan_create(self):
-        return LoanCreate(user_id=1, book_id=1)
+    @pytest.fixture(scope="class")
+    @classmethod
+    def sample_loan_create(cls):
+        return _LOAN_CREATE
 
     @pytest.fixture
-    def sample_active_loan(self, fixed_now):
-        return Loan(
-            id=1,
-            user_id=1,
-            book_id=1,
-            loan_date=fixed_now,
-            expected_return_date=fixed_now + timedelta(days=14),
-            status=LoanStatus.ACTIVE,
-            fine_amount=Decimal("0.00"),
-        )
+    def sample_active_loan(self):
+        return Loan(**_ACTIVE_LOAN_FIELDS)
+
+
+def _rejection(
+    *,
+    error: type[Exception],
+    message: str,
+    user: str | None = "sample_user",
+    active_count: int = 0,
+    overdue: str | None = None,
+    book: str | None = None,
+) -> dict:
+    """
+    Cenário de recusa em ``create_loan``; os nomes são fixtures resolvidos no teste.
+
+    O padrão é um usuário válido, sem empréstimos ativos nem atrasos, e sem livro.
+    """
+    return {
+        "user": user,
+        "active_count": active_count,
+        "overdue": overdue,
+        "book": book,
+        "error": error,
+        "message": message,
+    }
 
 
 class TestCreateLoan(TestLoanServiceFixtures):
-    @pytest.mark.asyncio
     async def test_create_loan_success(
         self, loan_service, sample_book, sample_user, sample_loan_create
     ):
         loan_service.user_repository.find_by_id.return_value = sample_user
-        loan_service.loan_repository.count_active_loans_by_user.return_value = 0
-        loan_service.loan_repository.find_overdue_loans_by_user.return_value = None
         loan_service.book_repository.find_by_id_with_lock.return_value = sample_book
 
         created_loan = Loan(
@@ -120,16 +224,13 @@ class TestCreateLoan(TestLoanServiceFixtures):
             user_id=sample_loan_create.user_id,
             book_id=sample_loan_create.book_id,
             loan_date=loan_service.get_now(),
-            expected_return_date=loan_service.get_now() + timedelta(days=14),
+            expected_return_date=loan_service.get_now() + _D14,
             status=LoanStatus.ACTIVE,
-            fine_amount=Decimal("0.00"),
+            fine_amount=_DEC_0,
         )
         loan_service.loan_repository.create.return_value = created_loan
 
-        with patch(
-            "app.domains.loans.services.AuditLogService.log_event", new=AsyncMock()
-        ):
-            loan = await loan_service.create_loan(sample_loan_create)
+        loan = await loan_service.create_loan(sample_loan_create)
 
         assert loan.user_id == 1
         assert loan.status == LoanStatus.ACTIVE
@@ -137,243 +238,211 @@ class TestCreateLoan(TestLoanServiceFixtures):
         loan_service.book_repository.update.assert_awaited_once()
         loan_service.loan_repository.create.assert_awaited_once()
 
-    @pytest.mark.asyncio
-    async def test_create_loan_user_not_found(self, loan_service, sample_loan_create):
-        loan_service.user_repository.find_by_id.return_value = None
-
-        with pytest.raises(LookupError) as exc:
-            await loan_service.create_loan(sample_loan_create)
-
-        assert ErrorMessages.USER_NOT_FOUND in str(exc.value)
-
-    @pytest.mark.asyncio
-    async def test_create_loan_book_not_found(
-        self, loan_service, sample_user, sample_loan_create
+    @pytest.mark.parametrize(
+        "case",
+        [
+            pytest.param(
+                _rejection(
+                    user=None, error=LookupError, message=ErrorMessages.USER_NOT_FOUND
+                ),
+                id="user-not-found",
+            ),
+            pytest.param(
+                _rejection(
+                    active_count=settings.MAX_ACTIVE_LOANS,
+                    book="sample_book",
+                    error=ValueError,
+                    message=ErrorMessages.LOAN_MAX_ACTIVE_LIMIT.format(
+                        limit=settings.MAX_ACTIVE_LOANS
+                    ),
+                ),
+                id="user-at-limit",
+            ),
+            pytest.param(
+                _rejection(
+                    active_count=1,
+                    overdue="sample_active_loan",
+                    book="sample_book",
+                    error=ValueError,
+                    message=ErrorMessages.LOAN_USER_HAS_OVERDUE,
+                ),
+                id="user-has-overdue",
+            ),
+            pytest.param(
+                _rejection(error=LookupError, message=ErrorMessages.BOOK_NOT_FOUND),
+                id="book-not-found",
+            ),
+            pytest.param(
+                _rejection(
+                    book="sample_book_no_copies",
+                    error=ValueError,
+                    message=ErrorMessages.BOOK_NOT_AVAILABLE,
+                ),
+                id="book-unavailable",
+            ),
+        ],
+    )
+    async def test_create_loan_rejected(
+        self, request, loan_service, sample_loan_create, case
     ):
-        loan_service.user_repository.find_by_id.return_value = sample_user
-        loan_service.loan_repository.count_active_loans_by_user.return_value = 0
-        loan_service.loan_repository.find_overdue_loans_by_user.return_value = None
-        loan_service.book_repository.find_by_id_with_lock.return_value = None
+        def resolve(fixture_name):
+            return request.getfixturevalue(fixture_name) if fixture_name else None
 
-        with pytest.raises(LookupError) as exc:
-            await loan_service.create_loan(sample_loan_create)
-
-        assert ErrorMessages.BOOK_NOT_FOUND in str(exc.value)
-
-    @pytest.mark.asyncio
-    async def test_create_loan_book_unavailable(
-        self,
-        loan_service,
-        sample_book_no_copies,
-        sample_user,
-        sample_loan_create,
-    ):
-        loan_service.user_repository.find_by_id.return_value = sample_user
-        loan_service.loan_repository.count_active_loans_by_user.return_value = 0
-        loan_service.loan_repository.find_overdue_loans_by_user.return_value = None
-        loan_service.book_repository.find_by_id_with_lock.return_value = (
-            sample_book_no_copies
+        loan_service.user_repository.find_by_id.return_value = resolve(case["user"])
+        loan_service.loan_repository.count_active_loans_by_user.return_value = case[
+            "active_count"
+        ]
+        loan_service.loan_repository.find_overdue_loans_by_user.return_value = resolve(
+            case["overdue"]
         )
-
-        with pytest.raises(ValueError) as exc:
-            await loan_service.create_loan(sample_loan_create)
-
-        assert ErrorMessages.BOOK_NOT_AVAILABLE in str(exc.value)
-
-    @pytest.mark.asyncio
-    @patch("app.domains.loans.services.settings")
-    async def test_create_loan_user_at_limit(
-        self,
-        mock_settings,
-        loan_service,
-        sample_book,
-        sample_user,
-        sample_loan_create,
-    ):
-        mock_settings.MAX_ACTIVE_LOANS = 3
-        loan_service.user_repository.find_by_id.return_value = sample_user
-        loan_service.loan_repository.count_active_loans_by_user.return_value = 3
-
-        with pytest.raises(ValueError) as exc:
-            await loan_service.create_loan(sample_loan_create)
-
-        assert "limite" in str(exc.value)
-
-    @pytest.mark.asyncio
-    async def test_create_loan_user_has_overdue(
-        self,
-        loan_service,
-        sample_book,
-        sample_user,
-        sample_loan_create,
-        sample_active_loan,
-    ):
-        loan_service.user_repository.find_by_id.return_value = sample_user
-        loan_service.loan_repository.count_active_loans_by_user.return_value = 1
-        loan_service.loan_repository.find_overdue_loans_by_user.return_value = (
-            sample_active_loan
+        loan_service.book_repository.find_by_id_with_lock.return_value = resolve(
+            case["book"]
         )
-        loan_service.book_repository.find_by_id_with_lock.return_value = sample_book
 
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(case["error"]) as exc:
             await loan_service.create_loan(sample_loan_create)
 
-        assert ErrorMessages.LOAN_USER_HAS_OVERDUE in str(exc.value)
+        # O limite chega formatado, então compara por igualdade e não identidade
+        assert exc.value.args == (case["message"],)
+        loan_service.loan_repository.create.assert_not_awaited()
 
 
 class TestReturnLoan(TestLoanServiceFixtures):
-    @pytest.mark.asyncio
     async def test_return_loan_success_no_fine(
         self, loan_service, sample_active_loan, sample_book, fixed_now
     ):
-        sample_active_loan.expected_return_date = fixed_now + timedelta(days=7)
+        sample_active_loan.expected_return_date = fixed_now + _D7
         loan_service.loan_repository.find_by_id_with_lock.return_value = (
             sample_active_loan
         )
         loan_service.book_repository.find_by_id_with_lock.return_value = sample_book
 
-        with patch(
-            "app.domains.loans.services.AuditLogService.log_event", new=AsyncMock()
-        ):
-            result = await loan_service.return_loan(loan_id=1)
+        result = await loan_service.return_loan(loan_id=1)
 
         assert result["fine_amount"] == "R$ 0.00"
         assert result["days_overdue"] == 0
         assert sample_active_loan.status == LoanStatus.RETURNED
 
-    @pytest.mark.asyncio
-    @patch("app.domains.loans.services.settings")
-    async def test_return_loan_with_fine(
-        self, mock_settings, loan_service, sample_book, fixed_now
-    ):
-        mock_settings.DAILY_FINE = Decimal("2.00")
-
-        overdue_loan = Loan(
-            id=1,
-            user_id=1,
-            book_id=1,
-            loan_date=fixed_now - timedelta(days=20),
-            expected_return_date=fixed_now - timedelta(days=5),
-            status=LoanStatus.ACTIVE,
-            fine_amount=Decimal("0.00"),
-        )
+    async def test_return_loan_with_fine(self, loan_service, sample_book, monkeypatch):
+        monkeypatch.setattr(settings, "DAILY_FINE", _DEC_2)
 
+        overdue_loan = _overdue_loan()
         loan_service.loan_repository.find_by_id_with_lock.return_value = overdue_loan
         loan_service.book_repository.find_by_id_with_lock.return_value = sample_book
 
-        with patch(
-            "app.domains.loans.services.AuditLogService.log_event", new=AsyncMock()
-        ):
-            result = await loan_service.return_loan(loan_id=1)
+        result = await loan_service.return_loan(loan_id=1)
 
         assert result["days_overdue"] == 5
         assert result["fine_amount"] == "R$ 10.00"
-        assert overdue_loan.fine_amount == Decimal("10.00")
+        assert overdue_loan.fine_amount == _DEC_10
 
-    @pytest.mark.asyncio
     async def test_return_loan_not_found(self, loan_service):
         loan_service.loan_repository.find_by_id_with_lock.return_value = None
 
         with pytest.raises(LookupError) as exc:
             await loan_service.return_loan(loan_id=999)
 
-        assert ErrorMessages.LOAN_NOT_FOUND in str(exc.value)
+        assert exc.value.args[0] is ErrorMessages.LOAN_NOT_FOUND
 
-    @pytest.mark.asyncio
     async def test_return_loan_already_returned(self, loan_service, fixed_now):
         returned_loan = Loan(
             id=1,
             user_id=1,
             book_id=1,
-            loan_date=fixed_now - timedelta(days=10),
-            expected_return_date=fixed_now - timedelta(days=3),
+            loan_date=fixed_now - _D10,
+            expected_return_date=fixed_now - _D3,
             return_date=fixed_now,
             status=LoanStatus.RETURNED,
-            fine_amount=Decimal("0.00"),
+            fine_amount=_DEC_0,
         )
         loan_service.loan_repository.find_by_id_with_lock.return_value = returned_loan
 
         with pytest.raises(ValueError) as exc:
             await loan_service.return_loan(loan_id=1)
 
-        assert ErrorMessages.LOAN_ALREADY_RETURNED in str(exc.value)
+        assert exc.value.args[0] is ErrorMessages.LOAN_ALREADY_RETURNED
 
-    @pytest.mark.asyncio
     async def test_return_loan_increments_available_copies(
         self, loan_service, sample_active_loan, sample_book, fixed_now
     ):
         initial_copies = sample_book.available_copies
-        sample_active_loan.expected_return_date = fixed_now + timedelta(days=7)
+        sample_active_loan.expected_return_date = fixed_now + _D7
         loan_service.loan_repository.find_by_id_with_lock.return_value = (
             sample_active_loan
         )
         loan_service.book_repository.find_by_id_with_lock.return_value = sample_book
 
-        with patch(
-            "app.domains.loans.services.AuditLogService.log_event", new=AsyncMock()
-        ):
-            await loan_service.return_loan(loan_id=1)
+        await loan_service.return_loan(loan_id=1)
 
         assert sample_book.available_copies == initial_copies + 1
 
 
 class TestExtendLoan(TestLoanServiceFixtures):
-    @pytest.mark.asyncio
     async def test_extend_loan_success(self, loan_service, sample_active_loan):
         loan_service.loan_repository.find_by_id_with_lock.return_value = (
             sample_active_loan
         )
 
-        with (
-            patch("app.domains.loans.services.settings", settings),
-            patch(
-                "app.domains.loans.services.AuditLogService.log_event", new=AsyncMock()
-            ),
-        ):
-            updated = await loan_service.extend_loan(loan_id=1)
+        updated = await loan_service.extend_loan(loan_id=1)
 
         assert updated.expected_return_date > sample_active_loan.loan_date
 
-    @pytest.mark.asyncio
-    async def test_extend_loan_overdue_raises(self, loan_service, fixed_now):
-        overdue_loan = Loan(
-            id=1,
-            user_id=1,
-            book_id=1,
-            loan_date=fixed_now - timedelta(days=20),
-            expected_return_date=fixed_now - timedelta(days=5),
-            status=LoanStatus.ACTIVE,
-            fine_amount=Decimal("0.00"),
-        )
+    async def test_extend_loan_overdue_raises(self, loan_service):
+        overdue_loan = _overdue_loan()
         loan_service.loan_repository.find_by_id_with_lock.return_value = overdue_loan
 
         with pytest.raises(ValueError) as exc:
             await loan_service.extend_loan(loan_id=1)
 
-        assert ErrorMessages.LOAN_RENEW_OVERDUE in str(exc.value)
+        assert exc.value.args[0] is ErrorMessages.LOAN_RENEW_OVERDUE
+
+
+def _active_loan() -> Loan:
+    return Loan(**_ACTIVE_LOAN_FIELDS)
 
 
 class TestListLoans(TestLoanServiceFixtures):
-    @pytest.mark.asyncio
-    async def test_list_loans_marks_overdue(self, loan_service, fixed_now):
-        overdue_loan = Loan(
-            id=1,
-            user_id=1,
-            book_id=1,
-            loan_date=fixed_now - timedelta(days=20),
-            expected_return_date=fixed_now - timedelta(days=5),
-            status=LoanStatus.ACTIVE,
-            fine_amount=Decimal("0.00"),
-        )
-        loan_service.loan_repository.find_all.return_value = [overdue_loan]
+    # Fábricas em vez de fixtures: cada caso recebe instâncias próprias
+    @pytest.mark.parametrize(
+        ("kwargs", "make_loans", "expected_statuses"),
+        [
+            pytest.param(
+                {}, lambda: [_active_loan()], [LoanStatus.ACTIVE], id="no-filters"
+            ),
+            pytest.param(
+                {"user_id": 1},
+                lambda: [_active_loan()],
+                [LoanStatus.ACTIVE],
+                id="user-id",
+            ),
+            pytest.param(
+                {"status": LoanStatus.ACTIVE},
+                lambda: [_active_loan()],
+                [LoanStatus.ACTIVE],
+                id="status",
+            ),
+            pytest.param({}, list, [], id="empty"),
+            pytest.param({"skip": 10, "limit": 5}, list, [], id="pagination"),
+            pytest.param(
+                {}, lambda: [_overdue_loan()], [LoanStatus.OVERDUE], id="marks-overdue"
+            ),
+        ],
+    )
+    async def test_list_loans(
+        self, loan_service, kwargs, make_loans, expected_statuses
+    ):
+        loan_service.loan_repository.find_all.return_value = make_loans()
 
-        loans = await loan_service.list_loans()
+        loans = await loan_service.list_loans(**kwargs)
 
-        assert loans[0].status == LoanStatus.OVERDUE
+        assert [loan.status for loan in loans] == expected_statuses
+        loan_service.loan_repository.find_all.assert_awaited_once_with(
+            **{"user_id": None, "status": None, "skip": 0, "limit": 10, **kwargs},
+            current_date=_FIXED_NOW,
+        )
 
 
 class TestInvalidateBooksCache(TestLoanServiceFixtures):
-    @pytest.mark.asyncio
     async def test_invalidate_books_cache_calls_redis(self, loan_service, mock_redis):
         async def scan_iter(match):
             for key in ["books:list:0:10::", "books:list:0:10:title:"]:
@@ -404,51 +473,62 @@ class TestExportLoansCSV(TestLoanServiceFixtures):
             id=1, name="John Doe", email="john@test.com", hashed_password="hash"
         )
 
-    @pytest.mark.asyncio
-    async def test_export_loans_csv_success(
+    @pytest.mark.parametrize(
+        ("kwargs", "loan_fields", "expected_status"),
+        [
+            pytest.param(
+                {},
+                {
+                    "loan_date": _FIXED_NOW - _D10,
+                    "expected_return_date": _FIXED_NOW - _D1,
+                    "return_date": _FIXED_NOW,
+                    "status": LoanStatus.RETURNED,
+                    "fine_amount": _DEC_4,
+                },
+                "RETURNED",
+                id="returned",
+            ),
+            pytest.param({"user_id": 1}, _ACTIVE_LOAN_FIELDS, "ACTIVE", id="user-id"),
+            pytest.param(
+                {"status": LoanStatus.ACTIVE},
+                _ACTIVE_LOAN_FIELDS,
+                "ACTIVE",
+                id="status",
+            ),
+            pytest.param({}, _OVERDUE_LOAN_FIELDS, "OVERDUE", id="marks-overdue"),
+        ],
+    )
+    async def test_export_loans_csv(
         self,
         loan_service,
         sample_book_for_export,
         sample_user_for_export,
-        fixed_now,
+        kwargs,
+        loan_fields,
+        expected_status,
     ):
-        loan = Loan(
-            id=1,
-            user_id=1,
-            book_id=1,
-            loan_date=fixed_now - timedelta(days=10),
-            expected_return_date=fixed_now - timedelta(days=1),
-            return_date=fixed_now,
-            status=LoanStatus.RETURNED,
-            fine_amount=Decimal("4.00"),
-        )
+        loan = Loan(**{**loan_fields, "id": 1, "user_id": 1, "book_id": 1})
         loan.user = sample_user_for_export
         loan.book = sample_book_for_export
 
-        loan_service.loan_repository.find_all_with_relations.side_effect = [
-            [loan],
-            [],
-        ]
-
-        csv_chunks = []
-        async for chunk in loan_service.export_loans_csv():
-            csv_chunks.append(chunk)
+        find_all = loan_service.loan_repository.find_all_with_relations
+        # Um lote com o empréstimo e, depois, lotes vazios
+        find_all.side_effect = chain([[loan]], repeat([]))
 
-        csv_data = "".join(csv_chunks)
+        missing = await _missing_in_stream(
+            loan_service.export_loans_csv(**kwargs),
+            {"ID", "John Doe", "Python Programming", expected_status},
+        )
 
-        assert "ID" in csv_data
-        assert "John Doe" in csv_data
-        assert "Python Programming" in csv_data
-        assert "RETURNED" in csv_data
+        assert not missing
+        forwarded = find_all.calls[0][1]
+        assert forwarded["user_id"] == kwargs.get("user_id")
+        assert forwarded["status"] == kwargs.get("status")
 
-    @pytest.mark.asyncio
     async def test_export_loans_csv_empty(self, loan_service):
         loan_service.loan_repository.find_all_with_relations.return_value = []
 
-        csv_chunks = []
-        async for chunk in loan_service.export_loans_csv():
-            csv_chunks.append(chunk)
+        csv_chunks = [chunk async for chunk in loan_service.export_loans_csv()]
 
-        csv_data = "".join(csv_chunks)
-        assert "ID" in csv_data
-        assert len(csv_data.strip().split("\n")) == 1
+        assert csv_chunks[0].startswith("ID")
+        assert sum(chunk.count("\n") for chunk in csv_chunks) == 1
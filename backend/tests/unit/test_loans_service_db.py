@@ -1,7 +1,7 @@
 import pytest
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
@@ -13,11 +13,18 @@ from app.domains.loans.models import Loan, LoanStatus
 from app.domains.loans.schemas import LoanCreate
 from app.domains.loans.services import LoanService
 from app.domains.users.models import User
+from tests.unit._async_stub import AsyncStub, empty_scan_iter
+
+_FIXED_NOW = datetime(2025, 1, 10, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _fixed_now() -> datetime:
+    return _FIXED_NOW
 
 
 @pytest.fixture
 def fixed_now():
-    return datetime(2025, 1, 10, 12, 0, 0, tzinfo=timezone.utc)
+    return _FIXED_NOW
 
 
 @pytest.fixture
@@ -44,15 +51,7 @@ async def db_session() -> AsyncSession:  # type: ignore
 
 @pytest.fixture
 def redis_stub():
-    redis = MagicMock()
-    redis.delete = AsyncMock()
-
-    async def empty_scan_iter(match):
-        return
-        yield
-
-    redis.scan_iter = empty_scan_iter
-    return redis
+    return SimpleNamespace(delete=AsyncStub(), scan_iter=empty_scan_iter)
 
 
 class TestLoanServiceWithDb:
@@ -71,7 +70,7 @@ class TestLoanServiceWithDb:
         await db_session.refresh(user)
         await db_session.refresh(book)
 
-        service = LoanService(db_session, redis_stub, get_now_fn=lambda: fixed_now)
+        service = LoanService(db_session, redis_stub, get_now_fn=_fixed_now)
         loan = await service.create_loan(LoanCreate(user_id=user.id, book_id=book.id))
 
         await db_session.refresh(book)
@@ -108,7 +107,7 @@ class TestLoanServiceWithDb:
         await db_session.commit()
         await db_session.refresh(loan)
 
-        service = LoanService(db_session, redis_stub, get_now_fn=lambda: fixed_now)
+        service = LoanService(db_session, redis_stub, get_now_fn=_fixed_now)
         result = await service.return_loan(loan_id=loan.id, actor_user_id=user.id)
 
         await db_session.refresh(loan)
@@ -182,6 +182,16 @@ class TestUserQueries(TestUserServiceFixtures):
 
         assert len(users) == 1
 
+    @pytest.mark.asyncio
+    async def test_list_users_forwards_keyset_cursor(self, service, sample_user):
+        service.repository.find_all.return_value = [sample_user]
+
+        await service.list_users(limit=5, after_id=42)
+
+        service.repository.find_all.assert_awaited_once_with(
+            skip=0, limit=5, after_id=42
+        )
+
     @pytest.mark.asyncio
     async def test_lookup_users(self, service, sample_user):
         service.repository.find_lookup.return_value = [sample_user]